@@ -1,12 +1,80 @@
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
 import json
 import os
+import gzip
+import time
+import hashlib
 import asyncio
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from collections import OrderedDict, namedtuple
+from contextlib import asynccontextmanager
 
 from .utils import quarterly_shift
+from .utils import instrumentation
+from .utils import job_runner
+from .utils import model_registry
+from .utils import pipeline_dag
+from .utils import progress_bus
+from .utils import sentiment_store
+from .utils import stream_pipeline
+from .utils import transcript_store
+
+try:
+    import brotli
+except ImportError:  # optional; gzip is always available
+    brotli = None
+
+# Set FINBERT_PRELOAD=1 to load FinBERT in the background when the API starts,
+# so the first pipeline run does not pay the model load.
+FINBERT_PRELOAD = os.getenv("FINBERT_PRELOAD", "").lower() in ("1", "true", "yes")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if FINBERT_PRELOAD:
+        threading.Thread(target=model_registry.load, daemon=True).start()
+    yield
+    # Let a running pipeline stop at its next checkpoint instead of being killed mid-write
+    pipeline_jobs.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
+
+REQUEST_SECONDS = instrumentation.REGISTRY.histogram(
+    "http_request_duration_seconds", "API request latency until the response starts.", ("method", "route", "status"))
+
+
+class RequestLatencyMiddleware:
+    """
+    Records REQUEST_SECONDS per request. Plain ASGI rather than
+    @app.middleware("http"), so streaming responses such as
+    /pipeline/events pass through untouched.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        start = time.perf_counter()
+
+        async def send_and_record(message):
+            if message["type"] == "http.response.start":
+                # Label by route template, not raw path, to keep the label set bounded
+                route = scope.get("route")
+                REQUEST_SECONDS.observe(time.perf_counter() - start, method=scope["method"],
+                                        route=getattr(route, "path", "unmatched"), status=str(message["status"]))
+            await send(message)
+
+        await self.app(scope, receive, send_and_record)
+
+
+app.add_middleware(RequestLatencyMiddleware)
 
-app = FastAPI()
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -20,24 +88,610 @@ PROCESSED_DIR = os.path.join(DATA_DIR, "processed_transcripts")
 SUMMARIES_DIR = os.path.join(DATA_DIR, "summaries")
 PIPELINE_STATUS_PATH = os.path.join(DATA_DIR, "pipeline_status.json")
 
+# Idle seconds after which /pipeline/events sends a keep-alive comment
+SSE_HEARTBEAT_SECONDS = 15
+
+# Memory cap for cached artifacts (transcript bodies dominate); least recently used go first
+ARTIFACT_CACHE_BYTES = int(os.getenv("ARTIFACT_CACHE_BYTES", str(64 * 1024 * 1024)))
+
+# Bodies smaller than this are sent uncompressed
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+# `etag` is the strong validator of the uncompressed body; `encoded` maps a
+# content coding ("br", "gzip") to its precompressed bytes.
+CachedArtifact = namedtuple("CachedArtifact", "signature value body etag encoded")
+
+
+class ArtifactCache:
+    """
+    Parsed artifacts and their serialized JSON response bytes, shared by the
+    read endpoints.
+
+    An entry is reused while the file's (mtime, size) and the cache
+    generation are unchanged, so a hit costs one stat. The pipeline bumps the
+    generation when it finishes, which drops everything at once even when a
+    rewrite kept the same mtime and size. Compressed variants are built once
+    per miss and stored with the entry. Entries are evicted least recently
+    used first once their bodies (compressed variants included) exceed
+    `max_bytes`.
+    """
+
+    def __init__(self, max_bytes: int = ARTIFACT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def bump_generation(self):
+        with self._lock:
+            self.generation += 1
+
+    def signature(self, path: str):
+        """(generation, mtime, size) of `path`, or None when it does not exist."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        with self._lock:
+            return (self.generation, st.st_mtime_ns, st.st_size)
+
+    def get(self, key, path: str, load):
+        """
+        Return the CachedArtifact for `key`, calling load(path) to build the
+        value on a miss, or None when `path` does not exist.
+        """
+        signature = self.signature(path)
+        if signature is None:
+            self._discard(key)
+            return None
+        # Load outside the lock; a concurrent miss on the same key just loads twice
+        return self._lookup(key, signature) or self._store(key, signature, load(path))
+
+    def get_composite(self, key, signature, build):
+        """
+        Like get(), for responses assembled from other entries: `signature`
+        identifies the inputs and build() returns the serialized body.
+        """
+        entry = self._lookup(key, signature)
+        if entry is None:
+            entry = self._store(key, signature, None, build())
+        return entry
+
+    def _lookup(self, key, signature):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.signature == signature:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+            return None
+
+    def _store(self, key, signature, value, body: bytes = None):
+        if body is None:
+            body = _serialize_json(value)
+        entry = CachedArtifact(signature, value, body, _etag(body), _compress(body))
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= _entry_size(old)
+            self._entries[key] = entry
+            self._bytes += _entry_size(entry)
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= _entry_size(evicted)
+                self.evictions += 1
+        return entry
+
+    def _discard(self, key):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= _entry_size(old)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "generation": self.generation,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+def _serialize_json(value) -> bytes:
+    # Same encoding as FastAPI's default JSONResponse
+    return json.dumps(value, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def _compress(body: bytes) -> dict:
+    if len(body) < COMPRESS_MIN_BYTES:
+        return {}
+    # mtime=0 keeps the gzip bytes a pure function of the body
+    encoded = {"gzip": gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)}
+    if brotli is not None:
+        encoded["br"] = brotli.compress(body, quality=BROTLI_QUALITY)
+    # Only keep codings that actually save bytes
+    return {coding: data for coding, data in encoded.items() if len(data) < len(body)}
+
+
+def _entry_size(entry: CachedArtifact) -> int:
+    return len(entry.body) + sum(len(data) for data in entry.encoded.values())
+
+
+def _variant_etag(etag: str, coding: str) -> str:
+    # Each coding is a different byte sequence, so it gets its own strong tag
+    return etag if coding == "identity" else f'{etag[:-1]}-{coding}"'
+
+
+def _accepted_codings(accept_encoding: str) -> set:
+    """Content codings a client accepts (q > 0) from its Accept-Encoding header."""
+    accepted = set()
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        q = 1.0
+        params = params.strip().lower()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if coding and q > 0:
+            accepted.add(coding)
+    return accepted
+
+
+def _if_none_match(header: str, entry: CachedArtifact) -> bool:
+    """
+    True when an If-None-Match header matches any representation of `entry`.
+    Uses the weak comparison RFC 9110 prescribes for If-None-Match, so
+    proxies that weaken our tags (W/"...") still get 304s.
+    """
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    if "*" in tags:
+        return True
+    current = {_variant_etag(entry.etag, coding) for coding in ("identity", *entry.encoded)}
+    return not tags.isdisjoint(current)
+
+
+def _load_json(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+artifact_cache = ArtifactCache()
+
+
+def _cached_response(request: Request, key, path: str, missing_detail: str, load=_load_json) -> Response:
+    entry = artifact_cache.get(key, path, load)
+    if entry is None:
+        raise HTTPException(status_code=404, detail=missing_detail)
+    return _send_cached(request, entry)
+
+
+def _send_cached(request: Request, entry: CachedArtifact) -> Response:
+    """
+    Serve a cached entry with a strong ETag. Answers a matching
+    If-None-Match with 304, and otherwise sends the precompressed variant the
+    client accepts (brotli, then gzip) when there is one.
+    """
+    accepted = _accepted_codings(request.headers.get("accept-encoding", ""))
+    coding = next((c for c in ("br", "gzip") if c in entry.encoded and c in accepted), "identity")
+    headers = {
+        "ETag": _variant_etag(entry.etag, coding),
+        # Let browsers keep a copy but revalidate it on every reload
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _if_none_match(if_none_match, entry):
+        return Response(status_code=304, headers=headers)
+
+    if coding == "identity":
+        return Response(content=entry.body, media_type="application/json", headers=headers)
+    headers["Content-Encoding"] = coding
+    return Response(content=entry.encoded[coding], media_type="application/json", headers=headers)
+
 
 @app.get("/health")
 def health():
     return {"status": "ok"}
 
-def _set_pipeline_status(message: str, state: str = "running"):
+# Live pipeline progress for /pipeline/events; the status file is only a durable fallback
+pipeline_events = progress_bus.ProgressBus()
+# Pipeline runs, one at a time, on their own thread
+pipeline_jobs = job_runner.JobRunner()
+
+# Extra fields (e.g. sentiment cache counters) carried along in every status update
+_status_details = {}
+# Stages of the current run, in start order: name, state, started_at, seconds
+_stages = []
+# Stages can run concurrently; this serializes status updates and file writes
+_status_lock = threading.RLock()
+
+
+def _set_pipeline_status(message: str, state: str = "running", details: dict = None, persist: bool = True):
     """
-    Write a simple JSON status file so the frontend can poll and display
-    where the pipeline currently is.
+    Publish where the pipeline currently is to live subscribers and
+    /pipeline/status. With `persist` the status is also written to the
+    status file, so it survives a restart; per-chunk progress skips the write.
     """
+    with _status_lock:
+        if details:
+            _status_details.update(details)
+        status = {"state": state, "message": message, **_status_details, "stages": [dict(s) for s in _stages]}
+        pipeline_events.publish("status", status, status=status)
+        if persist:
+            _write_status_file(status)
+
+
+def _write_status_file(status: dict):
     os.makedirs(DATA_DIR, exist_ok=True)
-    status = {"state": state, "message": message}
-    with open(PIPELINE_STATUS_PATH, "w", encoding="utf-8") as f:
+    tmp_path = PIPELINE_STATUS_PATH + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
         json.dump(status, f)
+    # Replace in one step so readers never see a half-written file
+    os.replace(tmp_path, PIPELINE_STATUS_PATH)
+
+
+def _read_status_file() -> dict:
+    if not os.path.exists(PIPELINE_STATUS_PATH):
+        return {"state": "idle", "message": "Pipeline has not been run yet."}
+    try:
+        with open(PIPELINE_STATUS_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except json.JSONDecodeError:
+        raise HTTPException(status_code=500, detail="Pipeline status file is corrupted")
+
+
+def _begin_stage(job, name: str, message: str, resource: str = None):
+    """Stop here if `job` was cancelled, otherwise mark stage `name` as running and announce it."""
+    if job is not None:
+        job.checkpoint()
+    with _status_lock:
+        _stages.append({"name": name, "state": "running", "resource": resource,
+                        "started_at": time.time(), "seconds": None})
+    pipeline_events.publish("stage", {"name": name, "state": "running", "resource": resource})
+    _set_pipeline_status(message, "running", {"stage": name})
+
+
+def _end_stage(name: str, state: str = "done"):
+    with _status_lock:
+        stage = next((s for s in _stages if s["name"] == name and s["state"] == "running"), None)
+        if stage is None:
+            return
+        stage["state"] = state
+        stage["seconds"] = time.time() - stage["started_at"]
+    pipeline_events.publish("stage", {"name": name, "state": state, "seconds": stage["seconds"]})
+
+
+# Sentiment results as they stream out of the current (or last) pipeline run
+_partial_lock = threading.Lock()
+_partial_sentiment = {"complete": False, "progress": 0.0, "sections": [], "results": []}
+
+
+def _reset_partial_sentiment():
+    with _partial_lock:
+        _partial_sentiment.update(complete=False, progress=0.0, sections=[], results=[])
+
+
+def _run_sentiment_stage(sentiment, job=None):
+    """
+    Drive the streaming sentiment generator, publishing each finished section
+    and transcript to /sentiment/partial and the progress bus, along with the
+    estimated fraction of the run that is done. Checks `job` for cancellation
+    after each transcript. Returns the final stats dict.
+    """
+    stats = {}
+    chunks_done = 0
+    total = 0
+    for event in sentiment.iter_process_all_transcripts():
+        kind = event["type"]
+        if kind == "start":
+            total = event["transcripts"]
+        elif kind == "progress":
+            instrumentation.count("chunks_scored", event["chunks_done"] - chunks_done)
+            instrumentation.count("tokens_scored", event["tokens"])
+            instrumentation.count("forward_passes")
+            chunks_done = event["chunks_done"]
+            with _partial_lock:
+                _partial_sentiment["progress"] = event["progress"]
+            _set_pipeline_status(
+                f"Analyzing sentiment with FinBERT ({event['chunks_done']} chunks, "
+                f"{event['transcripts_done']}/{total} transcripts)...",
+                "running",
+                {"sentiment_progress": event["progress"]},
+                persist=False,
+            )
+        elif kind == "section":
+            _publish_sentiment_section(event)
+        elif kind == "transcript":
+            _publish_sentiment_entry(event["entry"], event["progress"])
+            if job is not None:
+                job.checkpoint()
+        elif kind == "done":
+            stats = event["stats"]
+            with _partial_lock:
+                _partial_sentiment.update(complete=True, progress=1.0, results=event["results"])
+    return stats
+
+
+def _publish_sentiment_section(event: dict):
+    section = {k: event[k] for k in ("file", "quarter", "section", "result")}
+    with _partial_lock:
+        _partial_sentiment["sections"].append(section)
+    pipeline_events.publish("section", section)
+
+
+def _publish_sentiment_entry(entry: dict, progress: float):
+    with _partial_lock:
+        _partial_sentiment["results"].append(entry)
+        _partial_sentiment["progress"] = progress
+    pipeline_events.publish("transcript", {"entry": entry, "progress": progress})
+    instrumentation.count("transcripts")
+
+
+def _fetch_stage(job):
+    from .utils import fetch_transcripts
+    asyncio.run(fetch_transcripts.main())
+
+
+def _preprocess_stage(job):
+    from .utils import preprocess_transcripts
+    preprocess_changes = preprocess_transcripts.process_all_transcripts(checkpoint=job.checkpoint if job else None) or {}
+    instrumentation.count("transcripts", len(preprocess_changes.get("changed", [])))
+    _preprocess_finished(preprocess_changes)
+
+
+def _preprocess_finished(preprocess_changes: dict):
+    _set_pipeline_status(
+        "Preprocessing finished.",
+        "running",
+        {"preprocess_changes": {k: preprocess_changes[k] for k in ("changed", "removed") if k in preprocess_changes}},
+    )
+
+
+def _cleaner_version() -> str:
+    from .utils import preprocess_transcripts
+    return str(preprocess_transcripts.CLEANER_VERSION)
+
+
+def _sentiment_version() -> str:
+    from .utils import sentiment
+    return sentiment.config_version()
+
+
+def _themes_version() -> str:
+    from .utils import llm_theme_extraction
+    return llm_theme_extraction.config_version()
+
+
+def _sentiment_stage(job):
+    from .utils import sentiment
+    _sentiment_finished(_run_sentiment_stage(sentiment, job))
+
+
+def _sentiment_finished(sentiment_stats: dict):
+    details = {f"sentiment_{k}": sentiment_stats[k] for k in ("cache", "batching") if k in sentiment_stats}
+    _set_pipeline_status("Sentiment analysis finished.", "running", {"sentiment_progress": 1.0, **details})
+
+
+def _themes_stage(job):
+    from .utils import llm_theme_extraction
+    llm_theme_extraction.extract_themes_for_all_transcripts(checkpoint=job.checkpoint if job else None)
+
+
+def _quarterly_shift_stage(job):
+    quarterly_shift.write_quarterly_shift_json()
+
+
+def _shift_summary_stage(job):
+    from .utils import quarterly_shift_summary
+    quarterly_shift_summary.main()
+
+
+# The pipeline as a DAG over artifacts under DATA_DIR (see pipeline_dag); order is execution order
+PROCESSED_ARTIFACTS = (f"processed_transcripts/*{transcript_store.SUFFIX}", "processed_transcripts/*_turns.json")
+PIPELINE_STAGES = [
+    pipeline_dag.Stage("fetch", "Fetching latest NVIDIA earnings call transcripts...", _fetch_stage,
+                       inputs=(), outputs=("transcripts/*.txt",), always=True, resource="io"),
+    pipeline_dag.Stage("preprocess", "Preprocessing transcripts (cleaning, splitting management/Q&A)...",
+                       _preprocess_stage, inputs=("transcripts/*.txt",), outputs=PROCESSED_ARTIFACTS,
+                       version=_cleaner_version),
+    pipeline_dag.Stage("sentiment", "Analyzing sentiment across all quarters with FinBERT...", _sentiment_stage,
+                       inputs=PROCESSED_ARTIFACTS[:1], outputs=("sentiment_results.json",),
+                       version=_sentiment_version),
+    pipeline_dag.Stage("themes", "Extracting strategic focuses with llama3...", _themes_stage,
+                       inputs=PROCESSED_ARTIFACTS[:1],
+                       outputs=("strategic_focuses.json", "summaries/themes_manifest.json"),
+                       version=_themes_version, resource="io"),
+    pipeline_dag.Stage("quarterly_shift", "Building quarterly cross-call sentiment shift data...",
+                       _quarterly_shift_stage, inputs=("sentiment_results.json",), outputs=("quarterly_shift.json",)),
+    pipeline_dag.Stage("shift_summary", "Summarizing quarterly sentiment shifts with llama3...", _shift_summary_stage,
+                       inputs=("quarterly_shift.json",), outputs=("summaries/quarterly_shift_summary.txt",),
+                       resource="io"),
+]
+
+
+# Concurrent stages per resource lane: FinBERT gets the CPU to itself (it
+# parallelizes internally), while LLM and network stages mostly wait
+PIPELINE_LANES = {"cpu": 1, "io": 2}
+
+
+def _skip_stage(name: str, reason: str):
+    with _status_lock:
+        _stages.append({"name": name, "state": "skipped", "reason": reason, "started_at": time.time(), "seconds": 0.0})
+    pipeline_events.publish("stage", {"name": name, "state": "skipped", "reason": reason})
+
+
+def _execute_stage(stage, job):
+    """Run one stage on its lane's thread, timed as a span of the current run."""
+    instrumentation.begin_span(stage.name)
+    try:
+        stage.run(job)
+    except job_runner.JobCancelled:
+        instrumentation.end_span("cancelled")
+        raise
+    except BaseException:
+        instrumentation.end_span("error")
+        raise
+    instrumentation.end_span()
+
+
+# Per-transcript stages. When streaming, each transcript moves through them
+# on its own as soon as it has been fetched (see stream_pipeline), rather
+# than every transcript waiting at each stage for the slowest one, so the
+# first results land early and network, FinBERT and LLM waits overlap. Only
+# the cross-quarter stages after them wait for every transcript.
+STREAMED_STAGES = ("fetch", "preprocess", "sentiment", "themes")
+# Set PIPELINE_STREAMING=0 to run every stage over all transcripts at once instead
+STREAM_TRANSCRIPTS = os.getenv("PIPELINE_STREAMING", "1").lower() not in ("0", "false", "no")
+
+
+def _run_transcript_stream(job, state: dict):
+    """
+    Run the STREAMED_STAGES as one chain of per-transcript steps joined by
+    bounded queues, then record them in the DAG state as if each had run.
+    Each step still writes its combined artifact (sentiment_results.json,
+    strategic_focuses.json, the preprocess manifest) once, and only after
+    every transcript has passed through every step, so a chain that fails
+    or is cancelled part way writes none of them.
+    """
+    from .utils import fetch_transcripts
+    from .utils import llm_theme_extraction
+    from .utils import preprocess_transcripts
+    from .utils import sentiment
+
+    stages = {stage.name: stage for stage in PIPELINE_STAGES}
+    raw_dir = preprocess_transcripts.RAW_DIR
+    # Progress is estimated against the raw files present at the start until the fetch is done
+    counts = {
+        "expected": len(preprocess_transcripts.raw_transcripts(raw_dir)) if os.path.isdir(raw_dir) else 0,
+        "scored": 0,
+        "chunks": 0,
+    }
+    steps = {}
+
+    def fetch(emit):
+        fetched = set()
+
+        def saved(path):
+            fetched.add(os.path.basename(path))
+            emit(os.path.basename(path))
+
+        asyncio.run(fetch_transcripts.main(on_saved=saved))
+        # Then the transcripts already on disk that this fetch did not rewrite
+        names = preprocess_transcripts.raw_transcripts(raw_dir) if os.path.isdir(raw_dir) else []
+        for name in names:
+            if name not in fetched:
+                emit(name)
+        counts["expected"] = len(names)
+
+    def preprocess(filename):
+        if steps["preprocess"].update(filename):
+            instrumentation.count("transcripts")
+        return os.path.splitext(filename)[0]
+
+    def sentiment_progress():
+        progress = counts["scored"] / max(counts["expected"], counts["scored"], 1)
+        _set_pipeline_status(
+            f"Analyzing sentiment with FinBERT ({counts['chunks']} chunks, "
+            f"{counts['scored']}/{counts['expected']} transcripts)...",
+            "running",
+            {"sentiment_progress": progress},
+            persist=False,
+        )
+        return progress
+
+    def score(base):
+        for event in steps["sentiment"].score(base):
+            if event["type"] == "batch":
+                instrumentation.count("chunks_scored", event["chunks"])
+                instrumentation.count("tokens_scored", event["tokens"])
+                instrumentation.count("forward_passes")
+                counts["chunks"] += event["chunks"]
+                sentiment_progress()
+            elif event["type"] == "section":
+                _publish_sentiment_section(event)
+            elif event["type"] == "transcript":
+                counts["scored"] += 1
+                _publish_sentiment_entry(event["entry"], sentiment_progress())
+                instrumentation.mark("first_sentiment")
+        return base
+
+    def finish_sentiment():
+        results, stats = steps["sentiment"].finish()
+        with _partial_lock:
+            _partial_sentiment.update(complete=True, progress=1.0, results=results)
+        _sentiment_finished(stats)
+
+    def extract_themes(base):
+        steps["themes"].extract(base)
+        instrumentation.mark("first_transcript_done")
+        return base
+
+    def close_sentiment():
+        if "sentiment" in steps:
+            steps["sentiment"].close()
+
+    def opener(name, factory):
+        # Built on the step's own thread: the sentiment chunk cache is a SQLite connection
+        def start():
+            steps[name] = factory()
+        return start
+
+    chain = [
+        stream_pipeline.Step("preprocess", preprocess,
+                             start=opener("preprocess", preprocess_transcripts.PreprocessRun),
+                             finish=lambda: _preprocess_finished(steps["preprocess"].finish())),
+        stream_pipeline.Step("sentiment", score, start=opener("sentiment", sentiment.TranscriptScorer),
+                             finish=finish_sentiment, close=close_sentiment),
+        stream_pipeline.Step("themes", extract_themes, start=opener("themes", llm_theme_extraction.ThemeExtractor),
+                             finish=lambda: steps["themes"].finish()),
+    ]
+
+    def on_start(step):
+        instrumentation.begin_span(step.name)
+        stage = stages[step.name]
+        _begin_stage(job, stage.name, stage.message, stage.resource)
+
+    def on_end(step, error):
+        if error is None:
+            outcome = "done"
+        elif isinstance(error, (job_runner.JobCancelled, stream_pipeline.ChainAborted)):
+            outcome = "cancelled"
+        else:
+            outcome = "error"
+        instrumentation.end_span(outcome)
+        _end_stage(step.name, outcome)
+
+    stream_pipeline.run_chain(stream_pipeline.Step("fetch", fetch), chain,
+                              checkpoint=job.checkpoint if job is not None else None,
+                              on_start=on_start, on_end=on_end)
+
+    for name in STREAMED_STAGES:
+        _, _, inputs = pipeline_dag.decide(stages[name], state)
+        pipeline_dag.record_run(stages[name], state, inputs)
+    pipeline_dag.save_state(state)
 
 
 # Helper function to run the full pipeline
-def run_full_pipeline():
+def run_full_pipeline(job=None, force: bool = False, stream: bool = None):
     """
     Run the end-to-end pipeline:
     1. Fetch the latest NVIDIA earnings call transcripts.
@@ -49,46 +703,102 @@ def run_full_pipeline():
     
     This function assumes the corresponding scripts live in the same
     backend package and write outputs into DATA_DIR / PROCESSED_DIR.
-    """
-    # Import inside the function to avoid running heavy code on startup
-    from .utils import fetch_transcripts
-    from .utils import preprocess_transcripts
-    from .utils import sentiment
-    from .utils import quarterly_shift_summary
-    from .utils import llm_theme_extraction
 
-    _set_pipeline_status("Pipeline started. Fetching latest transcripts...", "running")
-    try:
-        # 1) Fetch the latest transcripts (async)
-        _set_pipeline_status("Fetching latest NVIDIA earnings call transcripts...", "running")
-        asyncio.run(fetch_transcripts.main())
+    Stages whose input artifacts have not changed since their last run (and
+    whose outputs are intact) are skipped; `force` runs every stage. A stage
+    starts as soon as the stages it depends on are finished, on the lane of
+    its resource class (PIPELINE_LANES), so FinBERT scoring overlaps the LLM
+    theme extraction. After a failure no new stage starts; running ones are
+    allowed to finish and the first error is raised.
 
-        # 2) Preprocess transcripts
-        _set_pipeline_status("Preprocessing transcripts (cleaning, splitting management/Q&A)...", "running")
-        preprocess_transcripts.process_all_transcripts()
+    With `stream` (default STREAM_TRANSCRIPTS) the per-transcript stages
+    run as one streaming chain instead (see _run_transcript_stream); their
+    artifacts are checked per transcript, so they are never skipped whole.
 
-        # 3) Run sentiment analysis
-        _set_pipeline_status("Analyzing sentiment across all quarters with FinBERT...", "running")
-        sentiment.process_all_transcripts()
-
-        # 4) Run LLM-based strategic focus extraction.
-        _set_pipeline_status("Extracting strategic focuses with llama3...", "running")
-        llm_theme_extraction.extract_themes_for_all_transcripts()
+    When run as a job (see pipeline_jobs), it stops at the next stage or
+    transcript boundary after the job is cancelled and re-raises
+    JobCancelled or the failure so the job records how it ended.
+    """
+    deps = pipeline_dag.dependencies(PIPELINE_STAGES)
+    # Per-stage timings, memory and item counts, saved under run_reports/ at the end
+    instrumentation.start_run(job.id if job is not None else None, dependencies=deps)
+    outcome = "error"
+    state = pipeline_dag.load_state()
+    stream = STREAM_TRANSCRIPTS if stream is None else stream
+    lanes = {
+        resource: ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"stage-{resource}")
+        for resource, workers in PIPELINE_LANES.items()
+    }
 
-        # 5) Build quarterly cross-call sentiment shift data
-        _set_pipeline_status("Building quarterly cross-call sentiment shift data...", "running")
-        quarterly_shift.write_quarterly_shift_json()
+    _set_pipeline_status("Pipeline started. Fetching latest transcripts...", "running")
+    try:
+        pending = list(PIPELINE_STAGES)
+        finished = set()
+        if stream:
+            _run_transcript_stream(job, state)
+            finished.update(STREAMED_STAGES)
+            pending = [stage for stage in pending if stage.name not in finished]
+        running = {}
+        error = None
+        while pending or running:
+            # Start (or skip) every stage whose dependencies are finished, in declaration order
+            ready = [s for s in pending if all(d in finished for d in deps[s.name])] if error is None else []
+            while ready:
+                stage = ready.pop(0)
+                pending.remove(stage)
+                # Decided only now, after upstream stages have rewritten what they had to
+                run, reason, inputs = pipeline_dag.decide(stage, state, force)
+                if not run:
+                    _skip_stage(stage.name, reason)
+                    finished.add(stage.name)
+                    ready = [s for s in pending if all(d in finished for d in deps[s.name])]
+                    continue
+                try:
+                    _begin_stage(job, stage.name, stage.message, stage.resource)
+                except job_runner.JobCancelled as e:
+                    # Let stages already running reach their own checkpoints
+                    error = e
+                    break
+                running[lanes[stage.resource].submit(_execute_stage, stage, job)] = (stage, inputs)
+            if not running:
+                break
 
-        # 6) Generate an LLM-written summary of the quarterly shifts
-        _set_pipeline_status("Summarizing quarterly sentiment shifts with llama3...", "running")
-        quarterly_shift_summary.main()
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, inputs = running.pop(future)
+                try:
+                    future.result()
+                except job_runner.JobCancelled as e:
+                    _end_stage(stage.name, "cancelled")
+                    error = error or e
+                    continue
+                except Exception as e:
+                    _end_stage(stage.name, "error")
+                    error = error or e
+                    continue
+                _end_stage(stage.name)
+                pipeline_dag.record_run(stage, state, inputs)
+                pipeline_dag.save_state(state)
+                finished.add(stage.name)
+        if error is not None:
+            raise error
 
+        outcome = "done"
         _set_pipeline_status("Pipeline completed successfully. Click “Reload data” to see updated results.", "done")
+    except job_runner.JobCancelled:
+        outcome = "cancelled"
+        _set_pipeline_status("Pipeline cancelled.", "cancelled")
+        raise
     except Exception as e:
-        # Record the failure in the status file so the frontend can display it
+        # Record the failure so the frontend can display it
         _set_pipeline_status(f"Pipeline failed: {e}", "error")
-        # Optionally re-raise or just swallow; for a background task it's often fine to swallow
-        # raise
+        raise
+    finally:
+        for lane in lanes.values():
+            lane.shutdown(wait=True)
+        # Whatever the stages rewrote, serve it fresh
+        artifact_cache.bump_generation()
+        instrumentation.finish_run(outcome)
 
 
 def _safe_basename(filename: str) -> str:
@@ -99,97 +809,380 @@ def _safe_basename(filename: str) -> str:
     return base
 
 
-@app.get("/transcripts")
-def list_transcripts():
-    if not os.path.isdir(PROCESSED_DIR):
-        raise HTTPException(status_code=404, detail="Processed transcripts directory not found")
-    files = [f for f in os.listdir(PROCESSED_DIR) if f.endswith(".txt")]
+def _list_processed(processed_dir: str) -> list:
+    # Each processed transcript is listed under its virtual per-section names
+    files = [
+        f"{base}{suffix}"
+        for base in transcript_store.list_transcripts(processed_dir)
+        for suffix in transcript_store.VIRTUAL_SUFFIXES.values()
+    ]
     return [{"name": f, "path": f"/transcript/{f}"} for f in files]
 
 
+@app.get("/transcripts")
+def list_transcripts(request: Request):
+    # A directory's mtime changes when files are added, removed or replaced
+    return _cached_response(request, ("transcripts",), PROCESSED_DIR, "Processed transcripts directory not found",
+                            load=_list_processed)
+
+
+def _read_processed_section(base: str, section: str) -> str:
+    path = transcript_store.transcript_path(base, PROCESSED_DIR)
+    if not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail="Transcript not found")
+    return transcript_store.read_section(path, section)
+
+
 @app.get("/transcript/{filename}")
-def get_transcript(filename: str):
+def get_transcript(filename: str, request: Request):
     name = _safe_basename(filename)
-    path = os.path.join(PROCESSED_DIR, name)
-    if not os.path.isfile(path):
+    resolved = transcript_store.resolve_virtual_name(name)
+    if resolved is None:
         raise HTTPException(status_code=404, detail="Transcript not found")
-    with open(path, "r", encoding="utf-8") as f:
-        return {"filename": name, "content": f.read()}
+    base, section = resolved
+    return _cached_response(
+        request,
+        ("transcript", name),
+        transcript_store.transcript_path(base, PROCESSED_DIR),
+        "Transcript not found",
+        load=lambda path: {"filename": name, "content": transcript_store.read_section(path, section)},
+    )
 
 
 @app.get("/sentiment")
-def get_sentiment():
+def get_sentiment(request: Request):
     path = os.path.join(DATA_DIR, "sentiment_results.json")
-    if not os.path.exists(path):
-        raise HTTPException(status_code=404, detail="sentiment_results.json not found")
-    with open(path) as f:
-        return json.load(f)
+    return _cached_response(request, ("sentiment",), path, "sentiment_results.json not found")
 
 
-@app.get("/strategic_focuses")
-def get_strategic_focuses():
-    path = os.path.join(DATA_DIR, "strategic_focuses.json")
+@app.get("/sentiment/partial")
+def get_partial_sentiment():
+    """
+    Sentiment results from the running pipeline as they arrive: finished
+    transcripts (same shape as /sentiment), finished sections, and the fraction
+    of chunks scored so far. `complete` turns true once sentiment_results.json
+    has been written.
+    """
+    with _partial_lock:
+        return {
+            "complete": _partial_sentiment["complete"],
+            "progress": _partial_sentiment["progress"],
+            "sections": list(_partial_sentiment["sections"]),
+            "results": list(_partial_sentiment["results"]),
+        }
+
+
+@app.get("/sentiment/passages")
+def get_sentiment_passages(
+    file: str,
+    section: str = "management",
+    level: str = "chunk",
+    label: str = None,
+    min_score: float = 0.0,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+):
+    """
+    Page through per-chunk or per-sentence FinBERT scores for one transcript
+    section, optionally keeping only passages whose `label` probability is at
+    least `min_score`. Each item carries its text and character offsets.
+    """
+    base = _safe_basename(file)
+    if section not in sentiment_store.SECTIONS:
+        raise HTTPException(status_code=400, detail=f"section must be one of {sentiment_store.SECTIONS}")
+    if level not in sentiment_store.LEVELS:
+        raise HTTPException(status_code=400, detail=f"level must be one of {sentiment_store.LEVELS}")
+    if label is not None and label not in sentiment_store.LABELS:
+        raise HTTPException(status_code=400, detail=f"label must be one of {sentiment_store.LABELS}")
+
+    path = sentiment_store.score_path(base, section, level)
     if not os.path.isfile(path):
-        raise HTTPException(status_code=404, detail="strategic_focuses.json not found")
+        raise HTTPException(status_code=404, detail="Passage scores not found")
+    page = sentiment_store.query_scores(path, label=label, min_score=min_score, offset=offset, limit=limit)
+
+    text_path = transcript_store.transcript_path(base, PROCESSED_DIR)
+    if os.path.isfile(text_path):
+        text = transcript_store.read_section(text_path, "prepared" if section == "management" else "qa")
+        for item in page["items"]:
+            item["text"] = text[item["start"]:item["end"]]
+
+    return {"file": base, "section": section, "level": level, **page}
+
+
+@app.get("/speaker_turns")
+def get_speaker_turns(file: str, section: str = None, role: str = None, speaker: str = None):
+    """
+    Speaker turns of one transcript from the index built during preprocessing,
+    optionally filtered by section, role (executive / analyst / operator) or
+    speaker name. Each turn carries its text, sliced by its character offsets.
+    """
+    base = _safe_basename(file)
+    path = os.path.join(PROCESSED_DIR, f"{base}_turns.json")
+    if not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail="Speaker turn index not found")
     with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
-    
+        turns = json.load(f)
+    turns = [
+        turn for turn in turns
+        if (section is None or turn["section"] == section)
+        and (role is None or turn["role"] == role)
+        and (speaker is None or turn["speaker"] == speaker)
+    ]
+
+    texts = {}
+    for turn in turns:
+        if turn["section"] not in texts:
+            texts[turn["section"]] = _read_processed_section(base, "prepared" if turn["section"] == "management" else "qa")
+        turn["text"] = texts[turn["section"]][turn["start"]:turn["end"]]
+
+    return {"file": base, "total": len(turns), "turns": turns}
+
+
+@app.get("/strategic_focuses")
+def get_strategic_focuses(request: Request):
+    path = os.path.join(DATA_DIR, "strategic_focuses.json")
+    return _cached_response(request, ("strategic_focuses",), path, "strategic_focuses.json not found")
+
 
 @app.get("/quarterly_prices")
-def get_quarterly_prices():
+def get_quarterly_prices(request: Request):
     path = os.path.join(DATA_DIR, "quarterly_prices.json")
-    if not os.path.exists(path):
-        raise HTTPException(status_code=404, detail="quarterly_prices.json not found")
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return _cached_response(request, ("quarterly_prices",), path, "quarterly_prices.json not found")
 
 
 @app.get("/quarterly_shift")
-def get_quarterly_shift():
+def get_quarterly_shift(request: Request):
     path = os.path.join(DATA_DIR, "quarterly_shift.json")
-    if not os.path.exists(path):
-        raise HTTPException(status_code=404, detail="quarterly_shift.json not found")
+    return _cached_response(request, ("quarterly_shift",), path, "quarterly_shift.json not found")
+
+
+def _load_summary(path: str) -> dict:
     with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+        return {"filename": os.path.basename(path), "content": f.read()}
 
 
 @app.get("/summaries/quarterly_shift")
-def get_quarterly_shift_summary():
+def get_quarterly_shift_summary(request: Request):
     if not os.path.isdir(SUMMARIES_DIR):
         raise HTTPException(status_code=404, detail="Summaries directory not found")
 
     path = os.path.join(SUMMARIES_DIR, "quarterly_shift_summary.txt")
-    if not os.path.isfile(path):
-        raise HTTPException(status_code=404, detail="quarterly_shift_summary.txt not found")
+    return _cached_response(request, ("summaries", "quarterly_shift"), path, "quarterly_shift_summary.txt not found",
+                            load=_load_summary)
+
+
+# Artifacts bundled by /dashboard: field -> (cache key shared with its own endpoint, path, loader)
+DASHBOARD_ARTIFACTS = {
+    "sentiment": (("sentiment",), os.path.join(DATA_DIR, "sentiment_results.json"), _load_json),
+    "strategic_focuses": (("strategic_focuses",), os.path.join(DATA_DIR, "strategic_focuses.json"), _load_json),
+    "quarterly_shift": (("quarterly_shift",), os.path.join(DATA_DIR, "quarterly_shift.json"), _load_json),
+    "quarterly_shift_summary": (("summaries", "quarterly_shift"),
+                                os.path.join(SUMMARIES_DIR, "quarterly_shift_summary.txt"), _load_summary),
+    "quarterly_prices": (("quarterly_prices",), os.path.join(DATA_DIR, "quarterly_prices.json"), _load_json),
+    "transcripts": (("transcripts",), PROCESSED_DIR, _list_processed),
+}
+# Re-reads allowed when an artifact changes while a snapshot is being taken
+SNAPSHOT_ATTEMPTS = 3
+
+
+def _dashboard_snapshot(fields: tuple) -> dict:
+    """
+    Cached entries (None when missing) for `fields`, taken so that none of the
+    files changed between the first read and the last. If the pipeline keeps
+    rewriting them, the last attempt is returned as is.
+    """
+    for _ in range(SNAPSHOT_ATTEMPTS):
+        parts = {field: artifact_cache.get(*DASHBOARD_ARTIFACTS[field]) for field in fields}
+        consistent = all(
+            (entry.signature if entry is not None else None) == artifact_cache.signature(DASHBOARD_ARTIFACTS[field][1])
+            for field, entry in parts.items()
+        )
+        if consistent:
+            break
+    return parts
+
+
+def _snapshot_version(parts: dict) -> str:
+    digest = hashlib.sha256()
+    for field, entry in parts.items():
+        digest.update(f"{field}={entry.etag if entry is not None else ''};".encode("utf-8"))
+    return digest.hexdigest()[:16]
 
-    with open(path, "r", encoding="utf-8") as f:
-        return {"filename": "quarterly_shift_summary.txt", "content": f.read()}
+
+def _render_dashboard(version: str, parts: dict) -> bytes:
+    # Splice the already-serialized artifact bodies instead of re-encoding them
+    missing = [field for field, entry in parts.items() if entry is None]
+    out = [b'{"version":', _serialize_json(version), b',"missing":', _serialize_json(missing)]
+    for field, entry in parts.items():
+        out += [b",", _serialize_json(field), b":", entry.body if entry is not None else b"null"]
+    out.append(b"}")
+    return b"".join(out)
+
+
+@app.get("/dashboard")
+def get_dashboard(request: Request, fields: str = None):
+    """
+    Every dashboard artifact in one response: `version` identifies this
+    snapshot, `missing` lists artifacts that do not exist yet (their fields
+    are null). Pass a comma-separated `fields` list to fetch only some of
+    them.
+    """
+    if fields:
+        selected = tuple(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+        unknown = [f for f in selected if f not in DASHBOARD_ARTIFACTS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields {unknown}; choose from {list(DASHBOARD_ARTIFACTS)}")
+    else:
+        selected = tuple(DASHBOARD_ARTIFACTS)
+
+    parts = _dashboard_snapshot(selected)
+    version = _snapshot_version(parts)
+    entry = artifact_cache.get_composite(("dashboard", selected), version, lambda: _render_dashboard(version, parts))
+    return _send_cached(request, entry)
 
 
 @app.get("/pipeline/status")
 def get_pipeline_status():
     """
-    Return the current pipeline status message and state so the frontend
-    can show live progress updates.
+    Return the current pipeline status message and state. Comes from memory
+    while this process has run the pipeline, otherwise from the status file
+    the last run left behind.
     """
-    if not os.path.exists(PIPELINE_STATUS_PATH):
-        return {"state": "idle", "message": "Pipeline has not been run yet."}
-    try:
-        with open(PIPELINE_STATUS_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except json.JSONDecodeError:
-        raise HTTPException(status_code=500, detail="Pipeline status file is corrupted")
+    return pipeline_events.status() or _read_status_file()
+
+
+@app.get("/pipeline/events")
+async def stream_pipeline_events(request: Request):
+    """
+    Server-Sent Events stream of pipeline progress. The first event is the
+    current status; after that come `status`, `stage` (start / finish with
+    seconds), `section` and `transcript` (sentiment as each one is scored).
+    """
+    async def events():
+        async for item in pipeline_events.subscribe(heartbeat=SSE_HEARTBEAT_SECONDS):
+            if await request.is_disconnected():
+                break
+            if item is None:
+                yield ": keep-alive\n\n"
+                continue
+            event, data = item
+            if event == "status" and not data:
+                try:
+                    data = _read_status_file()
+                except HTTPException as e:
+                    data = {"state": "error", "message": e.detail}
+            yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # Stop proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/models")
+def get_models():
+    """
+    Report which models are resident in this process and their memory footprint.
+    """
+    return model_registry.footprint()
+
+
+@app.post("/models/load")
+def load_models():
+    """Warm the FinBERT tokenizer and model so later pipeline runs reuse them."""
+    return model_registry.load()
+
+
+@app.post("/models/unload")
+def unload_models():
+    """Release the FinBERT model; it is reloaded lazily on the next pipeline run."""
+    return model_registry.unload()
+
+
+def _prepare_pipeline_run(job):
+    # Reset the pipeline status immediately so the frontend does not see
+    # a stale "done" state from the previous run on the first poll.
+    _status_details.clear()
+    _stages.clear()
+    _reset_partial_sentiment()
+    _set_pipeline_status("Pipeline requested. Waiting to start…", "running", {"job_id": job.id})
+
+
+def _job_or_404(job_id: str):
+    job = pipeline_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
 
 
 # Endpoint to trigger the full pipeline in the background
 @app.post("/pipeline/refresh")
-def refresh_pipeline(background_tasks: BackgroundTasks):
+def refresh_pipeline(force: bool = False, stream: bool = None):
     """
     Trigger the full pipeline (fetch, preprocess, sentiment, themes)
-    in the background.
+    in the background. Stages whose inputs did not change are skipped
+    unless `force` is set. `stream` overrides STREAM_TRANSCRIPTS for this
+    run. While a run is in flight, further refreshes join it and get its job
+    back instead of starting another.
     """
-    # Reset the pipeline status immediately so the frontend does not see
-    # a stale "done" state from the previous run on the first poll.
-    _set_pipeline_status("Pipeline requested. Waiting to start…", "running")
-    background_tasks.add_task(run_full_pipeline)
-    return {"status": "started"}
\ No newline at end of file
+    job, created = pipeline_jobs.submit("pipeline", lambda job: run_full_pipeline(job, force=force, stream=stream),
+                                        prepare=_prepare_pipeline_run)
+    return {"status": "started" if created else "already_running", "job": job.to_dict()}
+
+
+@app.get("/pipeline/plan")
+def get_pipeline_plan(force: bool = False, stream: bool = None):
+    """
+    Dry run of a refresh: for each stage, whether it would run, be skipped
+    or be re-checked once an upstream stage has run, and why. When
+    streaming, the per-transcript stages are marked "stream".
+    """
+    stream = STREAM_TRANSCRIPTS if stream is None else stream
+    steps = pipeline_dag.plan(PIPELINE_STAGES, force=force)
+    if stream:
+        for step in steps:
+            if step["stage"] in STREAMED_STAGES:
+                step.update(action="stream", reason="checked transcript by transcript as they are fetched")
+    return {"force": force, "stream": stream, "stages": steps}
+
+
+@app.get("/pipeline/jobs")
+def list_pipeline_jobs():
+    """Recent pipeline jobs, newest first."""
+    return [job.to_dict() for job in pipeline_jobs.jobs()]
+
+
+@app.get("/pipeline/jobs/{job_id}")
+def get_pipeline_job(job_id: str):
+    return _job_or_404(job_id).to_dict()
+
+
+@app.get("/pipeline/jobs/{job_id}/report")
+def get_pipeline_job_report(job_id: str):
+    """
+    Timing report of a finished run: per-stage wall time, RSS and item
+    throughput (chunks / tokens scored, LLM tokens generated, ...).
+    """
+    path = instrumentation.report_path(job_id)
+    if not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail="Run report not found")
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """Request latencies and pipeline stage metrics in the Prometheus text format."""
+    return PlainTextResponse(instrumentation.REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.post("/pipeline/jobs/{job_id}/cancel")
+def cancel_pipeline_job(job_id: str):
+    """
+    Ask a queued or running job to stop. It finishes the transcript it is
+    on, then ends with state "cancelled".
+    """
+    _job_or_404(job_id)
+    return pipeline_jobs.cancel(job_id).to_dict()
\ No newline at end of file
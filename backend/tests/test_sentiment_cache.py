@@ -0,0 +1,32 @@
+from backend.utils import sentiment_cache
+
+
+def test_chunks_and_sections_stay_bounded(tmp_path):
+    cache = sentiment_cache.SentimentCache(str(tmp_path / "cache.sqlite"), max_entries=5, max_sections=3)
+    try:
+        for i in range(12):
+            cache.put_many([(f"chunk-{i}", [0.1, 0.2, 0.7])])
+            cache.put_section(f"section-{i}", [f"chunk-{i}"], i)
+
+        stats = cache.stats()
+        assert stats["entries"] == 5
+        assert stats["sections"] == 3
+        # Least recently used entries go first
+        assert cache.get_section("section-0") is None
+        assert cache.get_section("section-11") == (["chunk-11"], 11)
+        assert set(cache.get_many([f"chunk-{i}" for i in range(12)])) == {f"chunk-{i}" for i in range(7, 12)}
+    finally:
+        cache.close()
+
+
+def test_recently_read_section_survives_eviction(tmp_path):
+    cache = sentiment_cache.SentimentCache(str(tmp_path / "cache.sqlite"), max_sections=2)
+    try:
+        cache.put_section("old", ["a"], 1)
+        cache.put_section("newer", ["b"], 1)
+        cache.get_section("old")
+        cache.put_section("newest", ["c"], 1)
+        assert cache.get_section("old") is not None
+        assert cache.get_section("newer") is None
+    finally:
+        cache.close()
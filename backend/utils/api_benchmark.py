@@ -0,0 +1,123 @@
+import os
+import json
+import time
+import statistics
+from datetime import datetime, timezone
+
+from fastapi.testclient import TestClient
+
+from .. import api
+
+# Dashboard reload benchmark.
+# Replays the requests the dashboard makes on "Reload data" (the six artifact
+# endpoints plus both sections of one transcript) against the in-process app
+# and reports bytes on the wire and latency for:
+#   cold       - empty artifact cache, no compression, no validators
+#   cold_gzip  - empty artifact cache, client accepts gzip / br
+#   warm       - artifacts cached, client resends the ETags it was given
+# With --bundle the six artifact requests are replaced by one /dashboard call.
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))          # .../backend/utils
+DATA_DIR = os.path.abspath(os.path.join(BASE_DIR, "..", "data"))  # .../backend/data
+BENCHMARK_DIR = os.path.join(DATA_DIR, "benchmarks")
+
+REPEATS = 20
+ARTIFACT_PATHS = (
+    "/sentiment",
+    "/strategic_focuses",
+    "/quarterly_shift",
+    "/summaries/quarterly_shift",
+    "/quarterly_prices",
+    "/transcripts",
+)
+
+
+def reload_paths(processed_dir=api.PROCESSED_DIR, bundle=False):
+    """Request paths of one dashboard reload, with the first transcript selected."""
+    paths = ["/dashboard"] if bundle else list(ARTIFACT_PATHS)
+    bases = api.transcript_store.list_transcripts(processed_dir)
+    if bases:
+        paths += [f"/transcript/{bases[0]}_prepared.txt", f"/transcript/{bases[0]}_qa.txt"]
+    return paths
+
+
+def _reload(client, paths, accept_encoding, etags=None):
+    """
+    Fetch every path once. Returns (wire bytes, seconds, statuses, etags).
+    Wire bytes are the response bodies as sent, before any decompression.
+    """
+    wire = 0
+    statuses = {}
+    seen = {}
+    start = time.perf_counter()
+    for path in paths:
+        headers = {"Accept-Encoding": accept_encoding}
+        if etags and path in etags:
+            headers["If-None-Match"] = etags[path]
+        response = client.get(path, headers=headers)
+        wire += response.num_bytes_downloaded
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        if "etag" in response.headers:
+            seen[path] = response.headers["etag"]
+    return wire, time.perf_counter() - start, statuses, seen
+
+
+def run_scenario(client, paths, accept_encoding, cold, repeats=REPEATS):
+    """Run `repeats` reloads; a cold scenario empties the artifact cache before each one."""
+    _, _, _, etags = _reload(client, paths, accept_encoding)
+    latencies = []
+    for _ in range(repeats):
+        if cold:
+            api.artifact_cache.bump_generation()
+        wire, seconds, statuses, _ = _reload(client, paths, accept_encoding, None if cold else etags)
+        latencies.append(seconds)
+    return {
+        "requests": len(paths),
+        "wire_bytes": wire,
+        "statuses": {str(code): count for code, count in sorted(statuses.items())},
+        "latency_median_ms": statistics.median(latencies) * 1000,
+        "latency_min_ms": min(latencies) * 1000,
+    }
+
+
+def run_benchmark(repeats=REPEATS, bundle=False):
+    paths = reload_paths(bundle=bundle)
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "bundle": bundle,
+        "paths": paths,
+        "repeats": repeats,
+        "brotli": api.brotli is not None,
+        "scenarios": {},
+    }
+    with TestClient(api.app) as client:
+        for name, accept_encoding, cold in (
+            ("cold", "identity", True),
+            ("cold_gzip", "br, gzip", True),
+            ("warm", "br, gzip", False),
+        ):
+            result = run_scenario(client, paths, accept_encoding, cold, repeats)
+            report["scenarios"][name] = result
+            print(f"{name}: {result['wire_bytes'] / 1024:.1f} KiB on the wire, "
+                  f"median {result['latency_median_ms']:.2f} ms, statuses {result['statuses']}")
+    report["cache"] = api.artifact_cache.stats()
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark cold and warm dashboard reloads against the API.")
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--bundle", action="store_true", help="load the artifacts through /dashboard")
+    parser.add_argument("--output", help="where to write the JSON report (default: data/benchmarks/)")
+    args = parser.parse_args()
+
+    report = run_benchmark(repeats=args.repeats, bundle=args.bundle)
+    output = args.output
+    if not output:
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = os.path.join(BENCHMARK_DIR, f"api_reload_{'bundle_' if args.bundle else ''}{stamp}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n Benchmark report saved to {output}")
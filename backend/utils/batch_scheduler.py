@@ -0,0 +1,53 @@
+# Length-bucketed batching for variable-length token sequences.
+# Batches are filled shortest-first so each one holds sequences of similar
+# length, and a batch is closed once (size x longest sequence) would exceed the
+# token budget. Callers scatter results back using the returned indices.
+
+TOKEN_BUDGET = 8192  # padded tokens per forward pass (16 full 512-token windows)
+
+
+def plan_batches(lengths, token_budget=TOKEN_BUDGET, max_batch_size=None):
+    """
+    Group item indices into batches whose padded size stays within `token_budget`.
+
+    `lengths` are the sequence lengths (special tokens included). A sequence
+    longer than the budget still gets a batch of its own. Returns a list of
+    index lists; every index appears exactly once.
+    """
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+    batches = []
+    current = []
+    for i in order:
+        # Sorted ascending, so the newcomer is always the longest in the batch
+        padded = lengths[i] * (len(current) + 1)
+        full = max_batch_size is not None and len(current) >= max_batch_size
+        if current and (padded > token_budget or full):
+            batches.append(current)
+            current = []
+        current.append(i)
+    if current:
+        batches.append(current)
+    return batches
+
+
+def fixed_batches(count, batch_size):
+    """Consecutive batches of `batch_size` items in original order (no bucketing)."""
+    batch_size = max(1, batch_size)
+    return [list(range(start, min(start + batch_size, count))) for start in range(0, count, batch_size)]
+
+
+def padding_stats(lengths, batches) -> dict:
+    """
+    Real vs padded token counts for a batch plan.
+
+    `padding_efficiency` is real / padded tokens: 1.0 means no compute was
+    spent on padding.
+    """
+    real = sum(lengths[i] for batch in batches for i in batch)
+    padded = sum(max(lengths[i] for i in batch) * len(batch) for batch in batches if batch)
+    return {
+        "forward_passes": len(batches),
+        "real_tokens": real,
+        "padded_tokens": padded,
+        "padding_efficiency": (real / padded) if padded else None,
+    }
@@ -4,6 +4,10 @@ from urllib.parse import urljoin
 from playwright.async_api import async_playwright
 from bs4 import BeautifulSoup
 
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))          # .../backend/utils
+DATA_DIR = os.path.abspath(os.path.join(BASE_DIR, "..", "data"))  # .../backend/data
+OUTPUT_DIR = os.path.join(DATA_DIR, "transcripts")
+
 BASE_URL = "https://www.fool.com"
 NVDA_PAGE = "https://www.fool.com/quote/nasdaq/nvda/"
 BUTTON_TEXT = "View More NVDA Earnings Transcripts"
@@ -57,6 +61,7 @@ async def find_nvda_transcript_urls(count: int = 4):
 async def fetch_transcript(url: str, output_dir: str = "transcripts"):
     """
     Fetch and save a Motley Fool transcript as a .txt file.
+    Returns the saved path, or None when no transcript was found.
     """
     async with async_playwright() as p:
         browser = await p.chromium.launch(headless=True)
@@ -82,7 +87,7 @@ async def fetch_transcript(url: str, output_dir: str = "transcripts"):
         with open(debug_path, "w", encoding="utf-8") as f:
             f.write(html)
         print(f"Saved debug HTML to {debug_path}")
-        return
+        return None
 
     text = article.get_text(separator="\n", strip=True)
     fname = url.rstrip("/").split("/")[-1] + ".txt"
@@ -92,13 +97,21 @@ async def fetch_transcript(url: str, output_dir: str = "transcripts"):
         f.write(text)
 
     print(f"Saved transcript to {outpath}")
+    return outpath
 
 
-async def main():
-    output_dir = "../data/transcripts"
+async def main(on_saved=None):
+    """
+    Fetch the latest transcripts one after another. `on_saved(path)` is
+    called as soon as each one is on disk, so callers can start on it while
+    the rest are still downloading.
+    """
+    output_dir = OUTPUT_DIR
     urls = await find_nvda_transcript_urls(count=4)
     for u in urls:
-        await fetch_transcript(u, output_dir)
+        path = await fetch_transcript(u, output_dir)
+        if path is not None and on_saved is not None:
+            on_saved(path)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,344 @@
+import os
+import sys
+import json
+import time
+import bisect
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+# Lightweight pipeline instrumentation.
+# Counters and histograms live in a process-wide registry that /metrics
+# renders in the Prometheus text format. A pipeline run additionally gets a
+# RunReport: one span per stage (wall time, RSS, items counted while it was
+# open), run-wide item totals and milestones (seconds from the start of the
+# run until e.g. the first transcript was fully processed), saved as JSON
+# when the run ends.
+# count() may be called from any loop of a running stage; it is a no-op
+# for the run report when no run is active.
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))          # .../backend/utils
+DATA_DIR = os.path.abspath(os.path.join(BASE_DIR, "..", "data"))  # .../backend/data
+REPORTS_DIR = os.path.join(DATA_DIR, "run_reports")
+
+# Seconds; wide enough for both API requests and multi-minute stages
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+
+
+def peak_rss_bytes():
+    """Peak resident set size of this process so far, or None where unsupported."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def rss_bytes():
+    """Current resident set size (Linux only), or None."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _label_text(labelnames, values) -> str:
+    if not labelnames:
+        return ""
+    pairs = []
+    for name, value in zip(labelnames, values):
+        escaped = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_label_text(self.labelnames, key)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (+Inf last), sum]
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        with self._lock:
+            counts, total = self._values.get(key) or ([0] * (len(self.buckets) + 1), 0.0)
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._values[key] = (counts, total + value)
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        names = self.labelnames + ("le",)
+        with self._lock:
+            for key, (counts, total) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(float(bound))
+                    lines.append(f"{self.name}_bucket{_label_text(names, key + (le,))} {cumulative}")
+                labels = _label_text(self.labelnames, key)
+                lines.append(f"{self.name}_sum{labels} {total}")
+                lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help: str, labelnames=()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+STAGE_SECONDS = REGISTRY.histogram("pipeline_stage_seconds", "Wall time of pipeline stages.", ("stage", "state"))
+ITEMS = REGISTRY.counter("pipeline_items_total", "Items processed by pipeline stages.", ("stage", "item"))
+RUNS = REGISTRY.counter("pipeline_runs_total", "Pipeline runs by final state.", ("state",))
+
+
+class RunReport:
+    """
+    Spans and item counts of one pipeline run. Stages may overlap: each
+    thread has at most one open span, and count() credits the span open on
+    the calling thread.
+    """
+
+    def __init__(self, run_id: str = None, dependencies: dict = None):
+        self.run_id = run_id or datetime.now().strftime("%Y%m%d-%H%M%S")
+        self.started_at = time.time()
+        self.state = "running"
+        self.dependencies = dependencies or {}
+        self.spans = []
+        self.items = {}
+        self.milestones = {}
+        self._open = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def begin(self, name: str):
+        """Open a span for stage `name` on this thread, closing the one already open here."""
+        self.end()
+        with self._lock:
+            self._open[name] = ({"name": name, "state": "running", "started_at": time.time(), "seconds": None,
+                                 "thread": threading.current_thread().name, "rss_start_bytes": rss_bytes(),
+                                 "items": {}}, time.perf_counter())
+        self._local.stage = name
+
+    def end(self, state: str = "done", name: str = None):
+        """Close span `name` (by default the one open on this thread)."""
+        if name is None:
+            name, self._local.stage = getattr(self._local, "stage", None), None
+        with self._lock:
+            span, start = self._open.pop(name, (None, None))
+            if span is None:
+                return
+            span["seconds"] = time.perf_counter() - start
+            span["state"] = state
+            span["rss_end_bytes"] = rss_bytes()
+            span["peak_rss_bytes"] = peak_rss_bytes()
+            self.spans.append(span)
+        STAGE_SECONDS.observe(span["seconds"], stage=span["name"], state=state)
+
+    def end_all(self, state: str):
+        with self._lock:
+            names = list(self._open)
+        for name in names:
+            self.end(state, name)
+
+    def count(self, item: str, amount: float = 1):
+        stage = getattr(self._local, "stage", None)
+        with self._lock:
+            if stage in self._open:
+                items = self._open[stage][0]["items"]
+                items[item] = items.get(item, 0) + amount
+            self.items[item] = self.items.get(item, 0) + amount
+        return stage or ""
+
+    def mark(self, name: str):
+        """Record when milestone `name` was first reached."""
+        with self._lock:
+            self.milestones.setdefault(name, time.time() - self.started_at)
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            spans = sorted((dict(span) for span in self.spans), key=lambda span: span["started_at"])
+        ends = [span["started_at"] + span["seconds"] for span in spans]
+        seconds = (max(ends) - self.started_at) if ends else 0.0
+        busy = sum(span["seconds"] for span in spans)
+        for span in spans:
+            span["throughput"] = {
+                item: (n / span["seconds"]) if span["seconds"] else None for item, n in span["items"].items()
+            }
+        path = critical_path(spans, self.dependencies)
+        return {
+            "run_id": self.run_id,
+            "state": self.state,
+            "started_at": self.started_at,
+            "seconds": seconds,
+            # Sum of stage times over wall time; above 1 when stages overlapped
+            "concurrency": (busy / seconds) if seconds else None,
+            "critical_path": path,
+            "critical_path_seconds": sum(span["seconds"] for span in spans if span["name"] in path),
+            "peak_rss_bytes": peak_rss_bytes(),
+            "items": dict(self.items),
+            "milestones": dict(self.milestones),
+            "spans": spans,
+        }
+
+
+def critical_path(spans, dependencies: dict) -> list:
+    """
+    Stage names on the chain that decided when the run ended: start from the
+    stage that finished last and repeatedly step to the dependency that
+    finished last. Stages without a span (skipped) are looked through.
+    """
+    ends = {span["name"]: span["started_at"] + span["seconds"] for span in spans}
+    if not ends:
+        return []
+
+    def timed_upstream(name, seen):
+        found = set()
+        for dep in dependencies.get(name, ()):
+            if dep in seen:
+                continue
+            seen.add(dep)
+            found |= {dep} if dep in ends else timed_upstream(dep, seen)
+        return found
+
+    name = max(ends, key=ends.get)
+    path = [name]
+    while True:
+        upstream = timed_upstream(name, set())
+        if not upstream:
+            break
+        name = max(upstream, key=ends.get)
+        path.append(name)
+    return path[::-1]
+
+
+_active = None
+_active_lock = threading.Lock()
+
+
+def start_run(run_id: str = None, dependencies: dict = None) -> RunReport:
+    global _active
+    with _active_lock:
+        _active = RunReport(run_id, dependencies)
+        return _active
+
+
+def current_run():
+    return _active
+
+
+def begin_span(name: str):
+    run = _active
+    if run is not None:
+        run.begin(name)
+
+
+def end_span(state: str = "done"):
+    run = _active
+    if run is not None:
+        run.end(state)
+
+
+@contextmanager
+def span(name: str):
+    """Time a block as a stage of the active run (a no-op without one)."""
+    begin_span(name)
+    try:
+        yield
+    except BaseException:
+        end_span("error")
+        raise
+    end_span()
+
+
+def count(item: str, amount: float = 1):
+    """Add `amount` items to the open span, the run totals and /metrics."""
+    if not amount:
+        return
+    run = _active
+    stage = run.count(item, amount) if run is not None else ""
+    ITEMS.inc(amount, stage=stage, item=item)
+
+
+def mark(name: str):
+    """Record the first time the active run reaches milestone `name` (a no-op without one)."""
+    run = _active
+    if run is not None:
+        run.mark(name)
+
+
+def finish_run(state: str, reports_dir: str = REPORTS_DIR) -> str:
+    """Close the active run, save its report and return the report path."""
+    global _active
+    with _active_lock:
+        run, _active = _active, None
+    if run is None:
+        return None
+    run.end_all(state)
+    run.state = state
+    RUNS.inc(state=state)
+    os.makedirs(reports_dir, exist_ok=True)
+    path = report_path(run.run_id, reports_dir)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(run.to_dict(), f, indent=2)
+    return path
+
+
+def report_path(run_id: str, reports_dir: str = REPORTS_DIR) -> str:
+    return os.path.join(reports_dir, f"{run_id}.json")
+
+
+def record_llm_response(response):
+    """Count one LLM call and the tokens Ollama reports for it."""
+    count("llm_calls")
+    get = getattr(response, "get", None)
+    if get is None:
+        return
+    count("llm_prompt_tokens", get("prompt_eval_count") or 0)
+    count("llm_tokens_generated", get("eval_count") or 0)
@@ -0,0 +1,124 @@
+import time
+import uuid
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# Single-flight runner for long pipeline jobs.
+# Jobs run one at a time on a dedicated thread, so a run never holds one of
+# the web server's request threads. Submitting while a job is queued or
+# running returns that job instead of starting another, so two refreshes can
+# never write the same artifacts at once. Cancellation is cooperative: the
+# job calls checkpoint() between stages and between transcripts.
+HISTORY = 20
+
+
+class JobCancelled(Exception):
+    """Raised by Job.checkpoint() once cancellation has been requested."""
+
+
+class Job:
+    def __init__(self, kind: str):
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.state = "queued"
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.error = None
+        self._cancel = threading.Event()
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel.is_set()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def checkpoint(self):
+        if self._cancel.is_set():
+            raise JobCancelled(f"Job {self.id} was cancelled")
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "state": self.state,
+            "cancel_requested": self.cancel_requested,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+        }
+
+
+class JobRunner:
+    def __init__(self, history: int = HISTORY):
+        self.history = history
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pipeline-job")
+        self._lock = threading.Lock()
+        self._jobs = OrderedDict()
+        self._active = None
+
+    def submit(self, kind: str, fn, prepare=None):
+        """
+        Queue fn(job) unless a job is already queued or running. Returns
+        (job, created), where `job` is the new or the in-flight job.
+        `prepare(job)` runs only for a new job, before it is queued.
+        """
+        with self._lock:
+            if self._active is not None:
+                return self._active, False
+            job = Job(kind)
+            if prepare is not None:
+                prepare(job)
+            self._active = job
+            self._jobs[job.id] = job
+            while len(self._jobs) > self.history:
+                self._jobs.popitem(last=False)
+        self._executor.submit(self._run, job, fn)
+        return job, True
+
+    def _run(self, job: Job, fn):
+        job.state = "running"
+        job.started_at = time.time()
+        try:
+            job.checkpoint()
+            fn(job)
+            job.state = "done"
+        except JobCancelled:
+            job.state = "cancelled"
+        except Exception as e:
+            job.state = "error"
+            job.error = str(e)
+        finally:
+            job.finished_at = time.time()
+            with self._lock:
+                if self._active is job:
+                    self._active = None
+
+    def get(self, job_id: str):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def active(self):
+        with self._lock:
+            return self._active
+
+    def jobs(self) -> list:
+        """Recent jobs, newest first."""
+        with self._lock:
+            return list(reversed(self._jobs.values()))
+
+    def cancel(self, job_id: str):
+        """Request cancellation; returns the job, or None when it is unknown."""
+        job = self.get(job_id)
+        if job is not None and job.state in ("queued", "running"):
+            job.cancel()
+        return job
+
+    def shutdown(self):
+        active = self.active()
+        if active is not None:
+            active.cancel()
+        self._executor.shutdown(wait=False)
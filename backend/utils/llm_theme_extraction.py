@@ -1,36 +1,27 @@
 import os, json, re
+import hashlib
 from ollama import chat
 from json_repair import repair_json
 
+from . import instrumentation
+from . import transcript_store
+
 # Config
 MODEL = "llama3"
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))          # .../backend/utils
 DATA_DIR = os.path.abspath(os.path.join(BASE_DIR, "..", "data", "processed_transcripts"))  # .../backend/data/processed_transcripts
 OUTPUT_FILE = os.path.join(BASE_DIR, "..", "data", "strategic_focuses.json")
 SUMMARY_DIR = os.path.join(BASE_DIR, "..", "data", "summaries")
-
-def summarize_transcript(text: str) -> str:
-    """
-    Summarize the transcript to shorten context before analysis.
-    """
-    prompt = (
-        "Summarize the key strategic and business points of NVIDIA's earnings call below "
-        "in under 400 words, focusing on growth drivers, initiatives, and major themes.\n\n"
-    )
-
-    response = chat(
-        model=MODEL,
-        messages=[{"role": "user", "content": prompt + text[:12000]}],  # limit for speed
-    )
-    summary = response["message"]["content"].strip()
-    return summary
-
-# Helper function to extract themes
-def extract_strategic_focuses(text: str, quarter: str):
-    """
-    Extract 3–5 concise strategic focuses as JSON.
-    """
-    prompt = f"""
+# Base name -> key of the transcript text the stored focuses were extracted from
+MANIFEST_FILE = os.path.join(SUMMARY_DIR, "themes_manifest.json")
+
+# Prompts; any change to them (or to MODEL) changes config_version()
+SUMMARY_PROMPT = (
+    "Summarize the key strategic and business points of NVIDIA's earnings call below "
+    "in under 400 words, focusing on growth drivers, initiatives, and major themes.\n\n"
+)
+# Filled in with .format(quarter=...); literal braces are doubled
+FOCUS_PROMPT = """
     You are an expert financial analyst reviewing NVIDIA's {quarter} earnings call.
 
     Identify exactly 3–5 key strategic focuses or initiatives that management emphasized.
@@ -56,10 +47,36 @@ def extract_strategic_focuses(text: str, quarter: str):
     </json>
     """
 
+
+def config_version() -> str:
+    """Short hash of MODEL and the prompts: the focuses extracted from a text change when it does."""
+    return hashlib.sha256(f"{MODEL}\0{SUMMARY_PROMPT}\0{FOCUS_PROMPT}".encode("utf-8")).hexdigest()[:16]
+
+
+def summarize_transcript(text: str) -> str:
+    """
+    Summarize the transcript to shorten context before analysis.
+    """
+    response = chat(
+        model=MODEL,
+        messages=[{"role": "user", "content": SUMMARY_PROMPT + text[:12000]}],  # limit for speed
+    )
+    instrumentation.record_llm_response(response)
+    summary = response["message"]["content"].strip()
+    return summary
+
+# Helper function to extract themes
+def extract_strategic_focuses(text: str, quarter: str):
+    """
+    Extract 3–5 concise strategic focuses as JSON.
+    """
+    prompt = FOCUS_PROMPT.format(quarter=quarter)
+
     response = chat(
         model=MODEL,
         messages=[{"role": "user", "content": prompt + "\n\n" + text}],
     )
+    instrumentation.record_llm_response(response)
 
     content = response["message"]["content"]
 
@@ -81,45 +98,97 @@ def extract_strategic_focuses(text: str, quarter: str):
     return focuses
 
 
-def extract_themes_for_all_transcripts():
+def _load_json(path: str, default):
+    if not os.path.exists(path):
+        return default
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except json.JSONDecodeError:
+        return default
+
+
+def _transcript_key(text: str) -> str:
+    # Focuses depend on the transcript text, the model that read it and the prompts
+    return hashlib.sha256(f"{config_version()}\0{text}".encode("utf-8")).hexdigest()
+
+
+class ThemeExtractor:
     """
-    Extract strategic focuses for all cleaned transcripts
-    and save to OUTPUT_PATH as JSON.
+    Extracts strategic focuses one transcript at a time.
+
+    Transcripts whose text (and MODEL) match MANIFEST_FILE keep their
+    previous focuses and summary, so only new or changed calls reach the
+    LLM; `force` redoes all of them. finish() writes OUTPUT_FILE and the
+    manifest for every transcript extracted so far.
     """
-    # Run extraction for all transcripts
-    results = {}
 
-    # Ensure summary output directory exists
-    os.makedirs(SUMMARY_DIR, exist_ok=True)
+    def __init__(self, force: bool = False):
+        self.force = force
+        self.previous = _load_json(OUTPUT_FILE, {})
+        self.manifest = _load_json(MANIFEST_FILE, {})
+        self.results = {}
+        self.current = {}
+        # Ensure summary output directory exists
+        os.makedirs(SUMMARY_DIR, exist_ok=True)
+
+    def extract(self, base: str) -> bool:
+        """Extract the focuses of one processed transcript; True when the LLM was called."""
+        quarter = base.upper()
+        path = transcript_store.transcript_path(base, DATA_DIR)
+        summary_path = os.path.join(SUMMARY_DIR, f"{base}_summary.txt")
+
+        text = transcript_store.read_section(path, "cleaned")
+        key = _transcript_key(text)
+        self.current[base] = key
+        if (not self.force and self.manifest.get(base) == key and quarter in self.previous
+                and os.path.isfile(summary_path)):
+            self.results[quarter] = self.previous[quarter]
+            return False
+
+        # Step 1: Summarize to reduce context length
+        summary = summarize_transcript(text)
+
+        # Save summary to a file in SUMMARY_DIR
+        with open(summary_path, "w", encoding="utf-8") as sf:
+            sf.write(summary)
+
+        # Step 2: Extract 3–5 key focuses
+        self.results[quarter] = extract_strategic_focuses(summary, quarter)
+        instrumentation.count("transcripts")
+        return True
+
+    def finish(self):
+        # Step 3: Save results, in transcript order whatever order they were extracted in
+        results = {base.upper(): self.results[base.upper()] for base in sorted(self.current)}
+        with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        with open(MANIFEST_FILE, "w", encoding="utf-8") as f:
+            json.dump(dict(sorted(self.current.items())), f, indent=2)
 
-    for filename in sorted(os.listdir(DATA_DIR)):
-        if not filename.endswith("cleaned.txt"):
-            continue
+        print(f"\nStrategic focuses saved to {OUTPUT_FILE}")
 
-        quarter = filename.replace("_cleaned.txt", "").upper()
-        path = os.path.join(DATA_DIR, filename)
 
-        with open(path, "r", encoding="utf-8") as f:
-            text = f.read()
-            # Step 1: Summarize to reduce context length
-            summary = summarize_transcript(text)
-
-            # Save summary to a file in SUMMARY_DIR
-            summary_filename = filename.replace("_cleaned.txt", "_summary.txt")
-            summary_path = os.path.join(SUMMARY_DIR, summary_filename)
-            with open(summary_path, "w", encoding="utf-8") as sf:
-                sf.write(summary)
-
-            # Step 2: Extract 3–5 key focuses
-            focuses = extract_strategic_focuses(summary, quarter)
-            results[quarter] = focuses
-
-        # Step 3: Save results
-    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
+def extract_themes_for_all_transcripts(checkpoint=None, force: bool = False):
+    """
+    Extract strategic focuses for all cleaned transcripts
+    and save to OUTPUT_PATH as JSON (see ThemeExtractor).
 
-    print(f"\nStrategic focuses saved to {OUTPUT_FILE}")
+    `checkpoint`, when given, is called before each transcript and may raise
+    to abandon the run; nothing is written to OUTPUT_PATH in that case.
+    """
+    extractor = ThemeExtractor(force=force)
+    for base in transcript_store.list_transcripts(DATA_DIR):
+        if checkpoint is not None:
+            checkpoint()
+        extractor.extract(base)
+    extractor.finish()
 
 
 if __name__ == "__main__":
-    extract_themes_for_all_transcripts()
\ No newline at end of file
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Extract strategic focuses from the processed transcripts.")
+    parser.add_argument("--force", action="store_true", help="re-extract transcripts that did not change")
+    args = parser.parse_args()
+    extract_themes_for_all_transcripts(force=args.force)
\ No newline at end of file
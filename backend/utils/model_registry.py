@@ -0,0 +1,246 @@
+import os
+import gc
+import re
+import time
+import threading
+
+# Process-wide cache of Hugging Face tokenizers / models.
+# Nothing heavy is imported until a model is actually requested, so importing
+# this module (or anything that depends on it) stays cheap.
+DEFAULT_MODEL = "ProsusAI/finbert"
+
+# Inference backends for sequence classification:
+#   "torch"      - eager fp32 PyTorch (reference)
+#   "torch-int8" - PyTorch dynamic int8 quantization of the Linear layers
+#   "onnx"       - exported ONNX graph run through onnxruntime (optional dependency)
+BACKENDS = ("torch", "torch-int8", "onnx")
+DEFAULT_BACKEND = os.getenv("FINBERT_BACKEND", "torch")
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))          # .../backend/utils
+ONNX_DIR = os.path.abspath(os.path.join(BASE_DIR, "..", "data", "cache", "onnx"))
+
+_lock = threading.RLock()
+_tokenizers = {}
+_models = {}
+_backends = {}
+_load_seconds = {}
+
+
+class TorchBackend:
+    """Runs a PyTorch sequence-classification model (eager or quantized)."""
+
+    tensor_type = "pt"
+
+    def __init__(self, model):
+        self.model = model
+
+    def predict(self, inputs):
+        """Return softmax probabilities, one row per sequence in the padded batch."""
+        import torch
+
+        with torch.no_grad():
+            logits = self.model(**inputs).logits
+        return torch.softmax(logits, dim=1).tolist()
+
+    def nbytes(self) -> int:
+        # Quantized Linear layers keep their weights in packed (tuple) state
+        # entries rather than parameters, so walk the state dict instead.
+        total = 0
+        for value in self.model.state_dict().values():
+            for t in value if isinstance(value, tuple) else (value,):
+                if hasattr(t, "element_size"):
+                    total += t.numel() * t.element_size()
+        return total
+
+
+class OnnxBackend:
+    """Runs an exported ONNX graph on the onnxruntime CPU provider."""
+
+    tensor_type = "np"
+
+    def __init__(self, path: str):
+        try:
+            import onnxruntime as ort
+        except ImportError as e:
+            raise ImportError("The 'onnx' backend needs onnxruntime: pip install onnx onnxruntime") from e
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        # Respect the per-worker thread budget set by sentiment's process pool
+        options.intra_op_num_threads = int(os.environ.get("OMP_NUM_THREADS", "0"))
+        self.path = path
+        self.session = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    def predict(self, inputs):
+        import numpy as np
+
+        feed = {k: v.astype(np.int64) for k, v in inputs.items() if k in self.input_names}
+        (logits,) = self.session.run(["logits"], feed)
+        exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+        return (exp / exp.sum(axis=1, keepdims=True)).tolist()
+
+    def nbytes(self) -> int:
+        return os.path.getsize(self.path)
+
+
+def get_tokenizer(name: str = DEFAULT_MODEL):
+    """Return the tokenizer for `name`, loading it on first use."""
+    with _lock:
+        if name not in _tokenizers:
+            from transformers import AutoTokenizer
+
+            start = time.perf_counter()
+            _tokenizers[name] = AutoTokenizer.from_pretrained(name)
+            _load_seconds[f"{name}:tokenizer"] = time.perf_counter() - start
+        return _tokenizers[name]
+
+
+def get_model(name: str = DEFAULT_MODEL):
+    """Return the sequence-classification model for `name` in eval mode, loading it on first use."""
+    with _lock:
+        if name not in _models:
+            from transformers import AutoModelForSequenceClassification
+
+            start = time.perf_counter()
+            model = AutoModelForSequenceClassification.from_pretrained(name)
+            model.eval()
+            _models[name] = model
+            _load_seconds[f"{name}:model"] = time.perf_counter() - start
+        return _models[name]
+
+
+def _onnx_path(name: str) -> str:
+    return os.path.join(ONNX_DIR, re.sub(r"[^A-Za-z0-9_.-]+", "_", name) + ".onnx")
+
+
+def _export_onnx(name: str, path: str):
+    """Export the eager model once; later loads reuse the file on disk."""
+    import torch
+
+    model = get_model(name)
+    tokenizer = get_tokenizer(name)
+    sample = tokenizer(["Revenue grew strongly this quarter."], return_tensors="pt")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            (sample["input_ids"], sample["attention_mask"]),
+            tmp_path,
+            input_names=["input_ids", "attention_mask"],
+            output_names=["logits"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "sequence"},
+                "attention_mask": {0: "batch", 1: "sequence"},
+                "logits": {0: "batch"},
+            },
+            opset_version=17,
+            dynamo=False,
+        )
+    os.replace(tmp_path, path)
+
+
+def get_backend(name: str = DEFAULT_MODEL, backend: str = DEFAULT_BACKEND):
+    """
+    Return an inference backend for `name` exposing `tensor_type`, `predict()`
+    and `nbytes()`, building it on first use.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend!r}; expected one of {BACKENDS}")
+
+    with _lock:
+        key = (name, backend)
+        if key not in _backends:
+            if backend == "torch":
+                _backends[key] = TorchBackend(get_model(name))
+            elif backend == "torch-int8":
+                import torch
+                from transformers import AutoModelForSequenceClassification
+
+                start = time.perf_counter()
+                # Quantize a private copy so the eager reference stays fp32
+                model = AutoModelForSequenceClassification.from_pretrained(name)
+                model.eval()
+                quantized = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+                _backends[key] = TorchBackend(quantized)
+                _load_seconds[f"{name}:{backend}"] = time.perf_counter() - start
+            else:
+                start = time.perf_counter()
+                path = _onnx_path(name)
+                if not os.path.exists(path):
+                    _export_onnx(name, path)
+                _backends[key] = OnnxBackend(path)
+                _load_seconds[f"{name}:{backend}"] = time.perf_counter() - start
+        return _backends[key]
+
+
+def load(name: str = DEFAULT_MODEL, backend: str = DEFAULT_BACKEND):
+    """Eagerly load the tokenizer and a backend (e.g. to warm the API process)."""
+    get_tokenizer(name)
+    get_backend(name, backend)
+    return footprint()
+
+
+def unload(name: str = None):
+    """Drop one model (or every model when `name` is None) and release its memory."""
+    with _lock:
+        names = [name] if name else list(set(_tokenizers) | set(_models) | {n for n, _ in _backends})
+        for n in names:
+            _tokenizers.pop(n, None)
+            _models.pop(n, None)
+            for key in [k for k in _backends if k[0] == n]:
+                del _backends[key]
+            for key in [k for k in _load_seconds if k.startswith(f"{n}:")]:
+                del _load_seconds[key]
+    gc.collect()
+    return footprint()
+
+
+def is_loaded(name: str = DEFAULT_MODEL) -> bool:
+    return name in _models
+
+
+def _current_rss_bytes():
+    """Resident set size of this process, or None where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def footprint() -> dict:
+    """
+    Report which models are resident and roughly how much memory they hold.
+
+    Model size is the sum of parameter and buffer storage (packed weights for
+    int8, graph file size for ONNX); `rss_bytes` is the whole process for context.
+    """
+    with _lock:
+        models = {}
+        for name in sorted(set(_tokenizers) | set(_models) | {n for n, _ in _backends}):
+            entry = {
+                "tokenizer_loaded": name in _tokenizers,
+                "model_loaded": name in _models,
+                "tokenizer_load_seconds": _load_seconds.get(f"{name}:tokenizer"),
+                "model_load_seconds": _load_seconds.get(f"{name}:model"),
+            }
+            model = _models.get(name)
+            if model is not None:
+                params = list(model.parameters())
+                buffers = list(model.buffers())
+                entry["parameters"] = sum(p.numel() for p in params)
+                entry["bytes"] = sum(t.numel() * t.element_size() for t in params + buffers)
+            entry["backends"] = {
+                backend: {
+                    "bytes": engine.nbytes(),
+                    "load_seconds": _load_seconds.get(f"{name}:{backend}", _load_seconds.get(f"{name}:model")),
+                }
+                for (n, backend), engine in _backends.items()
+                if n == name
+            }
+            models[name] = entry
+
+    return {"models": models, "rss_bytes": _current_rss_bytes()}
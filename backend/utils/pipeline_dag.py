@@ -0,0 +1,169 @@
+import os
+import glob
+import json
+import time
+import hashlib
+from collections import namedtuple
+
+# Declarative, incremental pipeline stages.
+# Each stage names the artifacts it reads and writes as glob patterns under
+# DATA_DIR. A stage depends on every earlier stage that writes one of its
+# input patterns. Before a stage runs, the content fingerprint of its inputs
+# (plus its version) is compared with the one recorded after its last
+# successful run, and the stage is skipped when nothing changed and its
+# outputs are still as it left them. Fingerprints live in STATE_FILE.
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))          # .../backend/utils
+DATA_DIR = os.path.abspath(os.path.join(BASE_DIR, "..", "data"))  # .../backend/data
+STATE_FILE = os.path.join(DATA_DIR, "pipeline_state.json")
+
+# run(job) does the work; message is the status line shown while it runs.
+# version (a string, or a callable returning one) changes when the stage's
+# code would produce different outputs from the same inputs. `always` stages
+# read an external source (e.g. the network) and run on every refresh.
+# `resource` names the executor lane the stage runs on ("cpu" for model work,
+# "io" for network / LLM waits), so independent stages on different lanes overlap.
+Stage = namedtuple("Stage", "name message run inputs outputs version always resource",
+                   defaults=("", False, "cpu"))
+
+# path -> ((mtime_ns, size), sha256); saves rehashing unchanged files
+_file_hashes = {}
+
+
+def _file_sha256(path: str) -> str:
+    st = os.stat(path)
+    signature = (st.st_mtime_ns, st.st_size)
+    cached = _file_hashes.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    with open(path, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    _file_hashes[path] = (signature, digest)
+    return digest
+
+
+def matching_files(patterns, data_dir: str = DATA_DIR) -> list:
+    paths = set()
+    for pattern in patterns:
+        paths.update(p for p in glob.glob(os.path.join(data_dir, pattern)) if os.path.isfile(p))
+    return sorted(paths)
+
+
+def fingerprint(patterns, data_dir: str = DATA_DIR, extra: str = ""):
+    """
+    Hash of the names and contents of every file matching `patterns`, or
+    None when nothing matches.
+    """
+    paths = matching_files(patterns, data_dir)
+    if not paths:
+        return None
+    digest = hashlib.sha256(extra.encode("utf-8"))
+    for path in paths:
+        digest.update(os.path.relpath(path, data_dir).encode("utf-8") + b"\0")
+        digest.update(_file_sha256(path).encode("ascii"))
+    return digest.hexdigest()
+
+
+def _version(stage: Stage) -> str:
+    return stage.version() if callable(stage.version) else stage.version
+
+
+def dependencies(stages) -> dict:
+    """
+    Stage name -> names of the earlier stages that write its inputs. Raises
+    ValueError when a stage reads something only a later stage writes.
+    """
+    deps = {}
+    writers = {}
+    for stage in stages:
+        deps[stage.name] = sorted({writers[p] for p in stage.inputs if p in writers})
+        for pattern in stage.outputs:
+            writers[pattern] = stage.name
+    for i, stage in enumerate(stages):
+        later = {p: s.name for s in stages[i + 1:] for p in s.outputs}
+        backwards = [later[p] for p in stage.inputs if p in later and later[p] != stage.name]
+        if backwards:
+            raise ValueError(f"Stage {stage.name} reads outputs of later stage(s) {backwards}")
+    return deps
+
+
+def load_state(path: str = STATE_FILE) -> dict:
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except json.JSONDecodeError:
+        # A damaged state only costs a full rerun
+        return {}
+
+
+def save_state(state: dict, path: str = STATE_FILE):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def decide(stage: Stage, state: dict, force: bool = False, data_dir: str = DATA_DIR):
+    """(should run, reason, input fingerprint) for one stage against `state`."""
+    inputs = fingerprint(stage.inputs, data_dir, extra=_version(stage)) if stage.inputs else _version(stage)
+    record = state.get(stage.name)
+    if force:
+        return True, "forced", inputs
+    if stage.always:
+        return True, "reads an external source", inputs
+    if record is None:
+        return True, "never run", inputs
+    if record.get("inputs") != inputs:
+        return True, "inputs changed", inputs
+    outputs = fingerprint(stage.outputs, data_dir)
+    if outputs is None:
+        return True, "outputs missing", inputs
+    if record.get("outputs") != outputs:
+        return True, "outputs modified since last run", inputs
+    return False, "up to date", inputs
+
+
+def record_run(stage: Stage, state: dict, inputs: str, data_dir: str = DATA_DIR):
+    state[stage.name] = {
+        "inputs": inputs,
+        "outputs": fingerprint(stage.outputs, data_dir),
+        "finished_at": time.time(),
+    }
+
+
+def plan(stages, force: bool = False, data_dir: str = DATA_DIR, state: dict = None) -> list:
+    """
+    Dry run: what a refresh would do with each stage right now. `action` is
+    "run", "skip", or "check" for a stage that is up to date but will be
+    re-checked after an upstream stage that is going to run.
+    """
+    state = load_state() if state is None else state
+    deps = dependencies(stages)
+    running = set()
+    steps = []
+    for stage in stages:
+        run, reason, _ = decide(stage, state, force, data_dir)
+        upstream = [name for name in deps[stage.name] if name in running]
+        if run:
+            action = "run"
+            running.add(stage.name)
+        elif upstream:
+            action = "check"
+            reason = f"up to date, re-checked after {', '.join(upstream)}"
+            # It may run, so anything downstream may have to as well
+            running.add(stage.name)
+        else:
+            action = "skip"
+        steps.append({
+            "stage": stage.name,
+            "action": action,
+            "reason": reason,
+            "depends_on": deps[stage.name],
+            "resource": stage.resource,
+            "inputs": list(stage.inputs),
+            "outputs": list(stage.outputs),
+            "last_run": (state.get(stage.name) or {}).get("finished_at"),
+        })
+    return steps
@@ -0,0 +1,162 @@
+import os
+import re
+import json
+import time
+import unicodedata
+
+from . import preprocess_transcripts
+
+# Transcript preprocessing micro-benchmark.
+# Times the current cleaner against a frozen copy of the original regex chain
+# on the bundled raw transcripts concatenated 1x / 10x / 100x, and checks that
+# both produce byte-identical output before reporting MB/s.
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))          # .../backend/utils
+DATA_DIR = os.path.abspath(os.path.join(BASE_DIR, "..", "data"))  # .../backend/data
+RAW_DIR = os.path.join(DATA_DIR, "transcripts")
+
+SCALES = (1, 10, 100)
+REPEATS = 3
+
+
+# Legacy reference (the cleaner as it was before the fused passes)
+def legacy_clean_text(text: str) -> str:
+    text = re.sub(r"Image source:.*?[\r\n]+", "", text)
+    text = re.sub(r"Contents:.*?(Prepared Remarks|Questions and Answers)", "", text, flags=re.I|re.S)
+    text = re.sub(r"Call Participants.*?(Prepared Remarks:)", "Prepared Remarks:", text, flags=re.I|re.S)
+    text = re.sub(r"Duration:.*", "", text)
+    text = re.sub(r"More .*analysis.*", "", text)
+    text = re.sub(r"^\s*--.*$", "", text, flags=re.MULTILINE)
+    text = re.sub(r"\[.*?\]", "", text)
+    text = re.sub(r"\(.*?%?\)", "", text)
+    text = re.sub(r"NVDA", "", text)
+    text = re.sub(r"\d{1,2}:\d{2}\s*(a\.m\.|p\.m\.)?\s*ET", "", text, flags=re.I)
+    text = re.sub(r"\n{2,}", "\n", text)
+    text = re.sub(r"\s{2,}", " ", text)
+    return text.strip()
+
+
+def legacy_remove_operator_intro(text: str) -> str:
+    match = re.search(r"(Colette Kress|Jensen Huang|Simona Jankowski)", text)
+    if match:
+        return text[match.start():]
+    return text
+
+
+def legacy_remove_call_participants(text: str) -> str:
+    text = re.sub(
+        r"(Call participants?:.*?$)(.|\n)*",
+        "",
+        text,
+        flags=re.IGNORECASE | re.MULTILINE,
+    )
+    return text.strip()
+
+
+def legacy_normalize_text(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text)
+    text = re.sub(r"[^a-zA-Z0-9.,;:!?'\-\n ]+", " ", text)
+    text = re.sub(r"\s{2,}", " ", text)
+    return text.strip()
+
+
+def legacy_preprocess_transcript(raw_text: str) -> dict:
+    qa_marker = re.search(r"Questions & Answers:", raw_text, re.IGNORECASE)
+    if qa_marker:
+        prepared_raw, qa_raw = raw_text[:qa_marker.start()], raw_text[qa_marker.start():]
+    else:
+        prepared_raw, qa_raw = raw_text, ""
+    prepared_clean = legacy_normalize_text(legacy_remove_operator_intro(legacy_clean_text(prepared_raw)))
+    qa_clean = legacy_normalize_text(legacy_remove_call_participants(legacy_clean_text(qa_raw)))
+    return {"prepared": prepared_clean, "qa": qa_clean}
+
+
+def current_clean(text: str) -> str:
+    return preprocess_transcripts.normalize_text(preprocess_transcripts.clean_text(text))
+
+
+def legacy_clean(text: str) -> str:
+    return legacy_normalize_text(legacy_clean_text(text))
+
+
+def load_raw_transcripts(raw_dir=RAW_DIR):
+    texts = []
+    for filename in sorted(os.listdir(raw_dir)):
+        if filename.lower().endswith(".txt"):
+            with open(os.path.join(raw_dir, filename), "r", encoding="utf-8") as f:
+                texts.append((filename, f.read()))
+    return texts
+
+
+def verify(texts):
+    """Names of transcripts whose processed output differs from the legacy cleaner."""
+    return [
+        name for name, text in texts
+        if preprocess_transcripts.preprocess_transcript(text) != legacy_preprocess_transcript(text)
+    ]
+
+
+def _best_seconds(fn, text, repeats):
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run_benchmark(scales=SCALES, repeats=REPEATS, stages=None):
+    """
+    Time each stage (name -> (legacy fn, current fn)) over the concatenated
+    corpus at every scale. Output equality is checked once per scale.
+    """
+    texts = load_raw_transcripts()
+    corpus = "\n".join(text for _, text in texts)
+    stages = stages or {
+        "clean": (legacy_clean, current_clean),
+        # The corpus opens with a 'Call participants:' heading, so this is the
+        # (.|\n)* tail removal over nearly the whole text
+        "participants": (legacy_remove_call_participants, preprocess_transcripts.remove_call_participants),
+        "preprocess": (legacy_preprocess_transcript, preprocess_transcripts.preprocess_transcript),
+    }
+
+    report = {"transcripts": len(texts), "mismatches": verify(texts), "repeats": repeats, "scales": {}}
+    for scale in scales:
+        text = "\n".join([corpus] * scale)
+        megabytes = len(text.encode("utf-8")) / 1e6
+        entry = {"megabytes": megabytes}
+        for stage, (legacy_fn, current_fn) in stages.items():
+            identical = legacy_fn(text) == current_fn(text)
+            legacy_seconds = _best_seconds(legacy_fn, text, repeats)
+            current_seconds = _best_seconds(current_fn, text, repeats)
+            entry[stage] = {
+                "identical": identical,
+                "legacy_mb_per_sec": megabytes / legacy_seconds if legacy_seconds else None,
+                "current_mb_per_sec": megabytes / current_seconds if current_seconds else None,
+                "speedup": legacy_seconds / current_seconds if current_seconds else None,
+            }
+            print(f"{scale}x ({megabytes:.1f} MB) {stage}: "
+                  f"{entry[stage]['legacy_mb_per_sec']:.1f} -> {entry[stage]['current_mb_per_sec']:.1f} MB/s "
+                  f"({entry[stage]['speedup']:.1f}x){'' if identical else '  OUTPUT DIFFERS'}")
+        report["scales"][f"{scale}x"] = entry
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark transcript cleaning against the legacy regex chain.")
+    parser.add_argument("--scales", type=int, nargs="+", default=list(SCALES))
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--output", help="optional path for the JSON report")
+    args = parser.parse_args()
+
+    report = run_benchmark(scales=args.scales, repeats=args.repeats)
+    if report["mismatches"]:
+        print(f"Output differs from the legacy cleaner for: {', '.join(report['mismatches'])}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n Benchmark report saved to {args.output}")
+    else:
+        print(json.dumps(report, indent=2))
@@ -1,51 +1,270 @@
 import os
 import re
+import json
+import hashlib
+import functools
+import string
 import unicodedata
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from tqdm import tqdm
 
-DATA_DIR = os.path.join(os.getcwd(), "../data")
+from . import transcript_store
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))          # .../backend/utils
+DATA_DIR = os.path.abspath(os.path.join(BASE_DIR, "..", "data"))  # .../backend/data
 RAW_DIR = os.path.join(DATA_DIR, "transcripts")
 PROCESSED_DIR = os.path.join(DATA_DIR, "processed_transcripts")
 os.makedirs(PROCESSED_DIR, exist_ok=True)
 
+# Incremental runs: the manifest records, per raw transcript, the hash of the
+# raw file and of each output written from it under CLEANER_VERSION. Bump the
+# version whenever a cleaning change can alter the output.
+CLEANER_VERSION = 2
+MANIFEST_FILE = os.path.join(PROCESSED_DIR, "manifest.json")
+OUTPUT_SUFFIXES = {"transcript": transcript_store.SUFFIX, "turns": "_turns.json"}
+# Per-section text files written before the single transcript file; removed on sight
+LEGACY_SUFFIXES = ("_cleaned.txt", "_prepared.txt", "_qa.txt")
+
+# Parallel runs
+WORKERS = 1                          # >1 spreads transcripts over a process pool
+CHUNK_SIZE = 8                       # transcripts per pool task
+
+# Precompiled patterns
+# The cleaner used to chain ~15 re.sub calls, each rescanning the whole text.
+# CPython's regex engine only skips ahead quickly when a pattern starts with a
+# literal, so every rule here is either anchored on a literal or replaced by
+# str operations; the output is byte-identical (see preprocess_benchmark.py).
+
+# Section and speaker boundaries: kind -> (pattern, case-sensitive). They are
+# located together in one left-to-right scan; the literals cannot overlap, so
+# the first match of each kind is its first occurrence.
+MARKERS = {
+    "qa": (r"Questions & Answers:", False),
+    "participants": (r"Call participants?:", False),
+    "executive": (r"Colette Kress|Jensen Huang|Simona Jankowski", True),
+}
+MARKER_KINDS = tuple(MARKERS)
+
+# Header blocks cut from "start" to the first "end" after it (case-insensitive),
+# as (start, end, replacement). ASCII text is searched lower-cased with plain
+# patterns; anything else falls back to re.IGNORECASE.
+HEADER_CUTS = (
+    ("contents:", "prepared remarks|questions and answers", ""),
+    ("call participants", "prepared remarks:", "Prepared Remarks:"),
+)
+HEADER_CUTS_ASCII = [(re.compile(s), re.compile(e), r) for s, e, r in HEADER_CUTS]
+HEADER_CUTS_UNICODE = [(re.compile(s, re.I), re.compile(e, re.I), r) for s, e, r in HEADER_CUTS]
+
+# Speaker turns. Raw transcripts introduce each speaker as "Name\n--\nTitle";
+# the operator gets a bare "Operator" line. Processed text keeps the name and
+# title lines, which is where turns are cut.
+SPEAKER_HEADER = re.compile(r"^([^\n]+)\n--\n([^\n]+)$", re.M)
+OPERATOR = "Operator"
+ROLES = ("executive", "analyst", "operator")
+# Index section -> processed section it points into
+TURN_SECTIONS = {"management": "prepared", "qa": "qa"}
+
+# Line artifacts, in the order the rules must apply
+IMAGE_CREDIT = re.compile(r"Image source:.*?[\r\n]+")
+DURATION = re.compile(r"Duration:.*")
+ANALYSIS_FOOTER = re.compile(r"More .*analysis.*")
+BRACKETED = re.compile(r"\[.*?\]")
+PARENTHESIZED = re.compile(r"\(.*?%?\)")
+TICKER = "NVDA"
+# Timestamps ("5:00 p.m. ET") are located through their ":dd" part
+TIME_HINT = re.compile(r":\d{2}")
+TIMESTAMP = re.compile(r"\d{1,2}:\d{2}\s*(a\.m\.|p\.m\.)?\s*ET", re.I)
+
+BLANK_LINES = re.compile(r"\n\n+")
+SPACE_RUNS = re.compile(r"  +")  # not " {2,}": only a literal prefix gets the fast search
+SPACES = re.compile(r"\s{2,}")
+SYMBOLS = re.compile(r"[^a-zA-Z0-9.,;:!?'\-\n ]+")
+# ASCII whitespace other than space / newline; text containing any takes the regex path
+OTHER_WHITESPACE = "\t\r\x0b\x0c\x1c\x1d\x1e\x1f"
+WORD_CHARS = string.ascii_letters + string.digits + ".,;:!?'-"
+SYMBOLS_TO_SPACE = str.maketrans({chr(c): " " for c in range(128) if chr(c) not in WORD_CHARS + "\n "})
+
+
+# Marker Locator
+@functools.lru_cache(maxsize=None)
+def _marker_pattern(kinds: tuple, lowered: bool) -> re.Pattern:
+    """
+    One alternation over `kinds`. With `lowered` it is matched against
+    lower-cased ASCII text, which keeps the regex engine on its fast
+    case-sensitive path; case-sensitive kinds are then re-checked on the original.
+    """
+    parts = []
+    for kind in kinds:
+        pattern, case_sensitive = MARKERS[kind]
+        if lowered:
+            pattern = pattern.lower()
+        elif not case_sensitive:
+            pattern = f"(?i:{pattern})"
+        parts.append(f"(?P<{kind}>{pattern})")
+    return re.compile("|".join(parts))
+
+
+@functools.lru_cache(maxsize=None)
+def _exact_marker(kind: str) -> re.Pattern:
+    return re.compile(MARKERS[kind][0])
+
+
+def locate_markers(text: str, kinds=MARKER_KINDS) -> dict:
+    """
+    Return {kind: offset} for the first occurrence of each requested marker
+    kind ("qa", "participants", "executive"); kinds that never occur are absent.
+
+    Linear in the length of the text: a single scan that drops each kind from
+    the pattern once it is found and stops when none are left.
+    """
+    ascii_only = text.isascii()
+    haystack = text.lower() if ascii_only else text
+    remaining = tuple(kinds)
+    found = {}
+    pos = 0
+    while remaining:
+        match = _marker_pattern(remaining, ascii_only).search(haystack, pos)
+        if not match:
+            break
+        kind = match.lastgroup
+        if ascii_only and MARKERS[kind][1] and not _exact_marker(kind).fullmatch(text, match.start(), match.end()):
+            # Matched only case-insensitively
+            pos = match.start() + 1
+            continue
+        found[kind] = match.start()
+        remaining = tuple(k for k in remaining if k != kind)
+        pos = match.end()
+    return found
+
+
 # Section Split
 def split_sections(text):
     """Separate prepared remarks and Q&A sections."""
-    qa_marker = re.search(r"Questions & Answers:", text, re.IGNORECASE)
-    if qa_marker:
-        return text[:qa_marker.start()], text[qa_marker.start():]
+    qa_start = locate_markers(text, ("qa",)).get("qa")
+    if qa_start is not None:
+        return text[:qa_start], text[qa_start:]
     else:
         return text, ""
 
 
+def _cut_blocks(text: str, haystack: str, start: re.Pattern, end: re.Pattern, replacement: str) -> str:
+    """
+    Replace each shortest 'start ... end' span (across lines) with `replacement`,
+    like a lazy DOTALL re.sub but searching `haystack` (same offsets as `text`).
+    """
+    parts = []
+    pos = 0
+    while True:
+        opening = start.search(haystack, pos)
+        if not opening:
+            break
+        closing = end.search(haystack, opening.end())
+        if not closing:
+            # No terminator after this opening, so none after any later one either
+            break
+        parts.append(text[pos:opening.start()])
+        parts.append(replacement)
+        pos = closing.end()
+    if not parts:
+        return text
+    parts.append(text[pos:])
+    return "".join(parts)
+
+
+def _remove_separator_lines(text: str) -> str:
+    """
+    re.sub(r"^\s*--.*$", "", text, flags=re.M), found from each "--" rather
+    than by trying every line start: the match begins at the first line start
+    in the whitespace before the dashes and runs to the end of their line.
+    """
+    parts = []
+    pos = 0
+    dashes = text.find("--")
+    while dashes != -1:
+        begin = dashes
+        while begin > pos and text[begin - 1].isspace():
+            begin -= 1
+        line_start = 0 if begin == 0 else text.find("\n", begin, dashes) + 1
+        if line_start == 0 and begin != 0:
+            dashes = text.find("--", dashes + 1)
+            continue
+        line_end = text.find("\n", dashes)
+        if line_end == -1:
+            line_end = len(text)
+        parts.append(text[pos:line_start])
+        pos = line_end
+        dashes = text.find("--", line_end)
+    if not parts:
+        return text
+    parts.append(text[pos:])
+    return "".join(parts)
+
+
+def _remove_timestamps(text: str) -> str:
+    """TIMESTAMP.sub("", text), trying matches only where a ":dd" occurs."""
+    parts = []
+    pos = 0
+    for hint in TIME_HINT.finditer(text):
+        colon = hint.start()
+        # Leftmost first: a two-digit hour starts one character earlier
+        for start in (colon - 2, colon - 1):
+            if start < pos:
+                continue
+            match = TIMESTAMP.match(text, start)
+            if match:
+                parts.append(text[pos:start])
+                pos = match.end()
+                break
+    if not parts:
+        return text
+    parts.append(text[pos:])
+    return "".join(parts)
+
+
+def _squeeze(text: str) -> str:
+    """
+    Turn every run of two or more spaces / newlines into a single space.
+    `text` must not contain any other whitespace.
+    """
+    # A newline next to another space or newline is part of a run
+    text = text.replace("\n\n", "  ").replace("\n ", "  ").replace(" \n", "  ")
+    return SPACE_RUNS.sub(" ", text)
+
+
 # Cleaning & Normalization
 def clean_text(text: str) -> str:
     """Remove non-content artifacts like metadata, timestamps, headers."""
-    text = re.sub(r"Image source:.*?[\r\n]+", "", text)
-    text = re.sub(r"Contents:.*?(Prepared Remarks|Questions and Answers)", "", text, flags=re.I|re.S)
-    text = re.sub(r"Call Participants.*?(Prepared Remarks:)", "Prepared Remarks:", text, flags=re.I|re.S)
-    text = re.sub(r"Duration:.*", "", text)
-    text = re.sub(r"More .*analysis.*", "", text)
+    text = IMAGE_CREDIT.sub("", text)
+    ascii_only = text.isascii()
+    for start, end, replacement in (HEADER_CUTS_ASCII if ascii_only else HEADER_CUTS_UNICODE):
+        text = _cut_blocks(text, text.lower() if ascii_only else text, start, end, replacement)
+    text = DURATION.sub("", text)
+    text = ANALYSIS_FOOTER.sub("", text)
 
     # Remove double hyphen lines and metadata
-    text = re.sub(r"^\s*--.*$", "", text, flags=re.MULTILINE)
-    text = re.sub(r"\[.*?\]", "", text)
-    text = re.sub(r"\(.*?%?\)", "", text)
+    text = _remove_separator_lines(text)
+    text = BRACKETED.sub("", text)
+    text = PARENTHESIZED.sub("", text)
 
     # Remove tickers, timestamps, and extra spacing
-    text = re.sub(r"NVDA", "", text)
-    text = re.sub(r"\d{1,2}:\d{2}\s*(a\.m\.|p\.m\.)?\s*ET", "", text, flags=re.I)
-    text = re.sub(r"\n{2,}", "\n", text)
-    text = re.sub(r"\s{2,}", " ", text)
+    text = text.replace(TICKER, "")
+    text = _remove_timestamps(text)
+    text = BLANK_LINES.sub("\n", text)
+    if text.isascii() and not any(c in text for c in OTHER_WHITESPACE):
+        text = _squeeze(text)
+    else:
+        text = SPACES.sub(" ", text)
     return text.strip()
 
 
 # Remove Operator Intro
 def remove_operator_intro(text: str) -> str:
     """Trim opening remarks before the first executive speaker."""
-    match = re.search(r"(Colette Kress|Jensen Huang|Simona Jankowski)", text)
-    if match:
-        return text[match.start():]
+    start = locate_markers(text, ("executive",)).get("executive")
+    if start is not None:
+        return text[start:]
     return text
 
 
@@ -54,21 +273,21 @@ def remove_call_participants(text: str) -> str:
     """
     Remove trailing 'Call participants' section and any 'More NVDA analysis' footer.
     """
-    # Match 'Call participants:' or similar
-    text = re.sub(
-        r"(Call participants?:.*?$)(.|\n)*",  # capture everything after that heading
-        "",
-        text,
-        flags=re.IGNORECASE | re.MULTILINE,
-    )
+    # Everything from the first 'Call participants:' heading on is dropped
+    start = locate_markers(text, ("participants",)).get("participants")
+    if start is not None:
+        text = text[:start]
     return text.strip()
 
 
 def normalize_text(text: str) -> str:
     """Normalize unicode characters and remove weird symbols."""
+    if text.isascii():
+        # NFKD leaves ASCII unchanged; map each symbol to a space, then collapse
+        return _squeeze(text.translate(SYMBOLS_TO_SPACE)).strip()
     text = unicodedata.normalize("NFKD", text)
-    text = re.sub(r"[^a-zA-Z0-9.,;:!?'\-\n ]+", " ", text)
-    text = re.sub(r"\s{2,}", " ", text)
+    text = SYMBOLS.sub(" ", text)
+    text = SPACES.sub(" ", text)
     return text.strip()
 
 
@@ -83,35 +302,325 @@ def preprocess_transcript(raw_text: str) -> dict:
     return {"prepared": prepared_clean, "qa": qa_clean}
 
 
-# Process All Files
-def process_all_transcripts():
-    print("Preprocessing transcripts (split → clean → normalize)...")
-    for filename in tqdm(os.listdir(RAW_DIR), desc="Processing transcripts"):
-        if not filename.lower().endswith(".txt"):
-            continue
+# Speaker Turns
+def speaker_roster(raw_text: str) -> dict:
+    """Map each introduced speaker's name to their title, both as they read after normalize_text."""
+    roster = {}
+    for match in SPEAKER_HEADER.finditer(raw_text):
+        name = normalize_text(match.group(1))
+        if name and name != OPERATOR:
+            roster.setdefault(name, normalize_text(match.group(2)))
+    return roster
+
+
+def _speaker_role(name: str, title: str) -> str:
+    if name == OPERATOR:
+        return "operator"
+    return "analyst" if title.lower().endswith("analyst") else "executive"
+
+
+def _section_turns(text: str, section: str, roster: dict) -> list:
+    """
+    Cut one processed section into turns at its speaker headers: a roster
+    name line followed by that speaker's title line, or an "Operator" line
+    (the operator's words can share its line once bracketed cues are cleaned out).
+    Text before the first header is not attributed.
+    """
+    lines = text.split("\n")
+    starts = [0]
+    for line in lines[:-1]:
+        starts.append(starts[-1] + len(line) + 1)
+
+    turns = []
+    current = None
+    i = 0
+    while i < len(lines):
+        line = lines[i].strip()
+        body = None
+        if line == OPERATOR:
+            speaker, title, body = OPERATOR, "", starts[i + 1] if i + 1 < len(lines) else len(text)
+        elif line.startswith(OPERATOR + " "):
+            speaker, title, body = OPERATOR, "", starts[i] + lines[i].index(OPERATOR) + len(OPERATOR) + 1
+        elif line in roster and i + 1 < len(lines) and lines[i + 1].strip() == roster[line]:
+            speaker, title = line, roster[line]
+            i += 1
+            body = starts[i + 1] if i + 1 < len(lines) else len(text)
+        if body is not None:
+            if current:
+                turns.append(current)
+            current = {"speaker": speaker, "role": _speaker_role(speaker, title), "section": section,
+                       "start": body, "end": body}
+        if current:
+            current["end"] = starts[i] + len(lines[i].rstrip())
+        i += 1
+    if current:
+        turns.append(current)
+    return [turn for turn in turns if turn["end"] > turn["start"]]
+
+
+def index_speaker_turns(raw_text: str, processed: dict) -> list:
+    """
+    Speaker turns of one transcript, in order: speaker, role (executive /
+    analyst / operator), section ("management" / "qa") and the [start, end)
+    character offsets of what they said in that processed section.
+    """
+    roster = speaker_roster(raw_text)
+    turns = []
+    for section, key in TURN_SECTIONS.items():
+        turns.extend(_section_turns(processed[key], section, roster))
+    return turns
 
-        path = os.path.join(RAW_DIR, filename)
+
+def load_speaker_turns(base_name: str, processed_dir: str = PROCESSED_DIR) -> list:
+    """Saved turn index of one transcript ([] when it has not been built)."""
+    try:
+        with open(os.path.join(processed_dir, f"{base_name}{OUTPUT_SUFFIXES['turns']}"), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+
+# Manifest
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def load_manifest(path: str = MANIFEST_FILE) -> dict:
+    """Return the saved manifest, or an empty one if it is missing or unreadable."""
+    try:
         with open(path, "r", encoding="utf-8") as f:
-            raw_text = f.read()
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {"cleaner_version": None, "files": {}}
+    manifest.setdefault("files", {})
+    return manifest
+
+
+def _save_manifest(manifest: dict, path: str = MANIFEST_FILE):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _file_matches(path: str, digest: str) -> bool:
+    try:
+        with open(path, "rb") as f:
+            return _sha256(f.read()) == digest
+    except OSError:
+        return False
+
+
+def _write_if_changed(path: str, data: bytes) -> bool:
+    """Write `data` unless the file already holds exactly it; True when written."""
+    try:
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return False
+    except OSError:
+        pass
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return True
+
+
+def output_paths(base_name: str, processed_dir: str = PROCESSED_DIR) -> dict:
+    return {kind: os.path.join(processed_dir, f"{base_name}{suffix}") for kind, suffix in OUTPUT_SUFFIXES.items()}
+
+
+def render_outputs(processed: dict, turns: list) -> dict:
+    """Encoded file contents for each output kind of one processed transcript."""
+    return {
+        "transcript": transcript_store.render(processed["prepared"], processed["qa"]),
+        "turns": json.dumps(turns, separators=(",", ":")).encode("utf-8"),
+    }
+
+
+def _remove_legacy_outputs(base_name: str, processed_dir: str = PROCESSED_DIR):
+    for suffix in LEGACY_SUFFIXES:
+        path = os.path.join(processed_dir, f"{base_name}{suffix}")
+        if os.path.exists(path):
+            os.remove(path)
+
+
+# Parallel Processing
+def _update_file(task):
+    """
+    Bring the outputs of one raw transcript up to date, in-process or in a pool worker.
+
+    `task` is (filename, manifest entry or None, reuse), reuse being False when
+    the run is forced or the cleaner version changed. The raw file is hashed
+    here; when it and every output on disk match the entry, nothing else is
+    done. Otherwise the transcript is preprocessed and each output written
+    unless it already holds exactly those bytes.
+
+    Returns (filename, raw hash, manifest entry, outputs written), the entry
+    being the one passed in when the transcript was current and written None.
+    """
+    filename, entry, reuse = task
+    base_name = os.path.splitext(filename)[0]
+    paths = output_paths(base_name)
+    with open(os.path.join(RAW_DIR, filename), "rb") as f:
+        raw = f.read()
+    raw_hash = _sha256(raw)
+    if reuse and entry is not None and entry.get("raw_sha256") == raw_hash and all(
+        _file_matches(paths[kind], entry.get("outputs", {}).get(kind)) for kind in paths
+    ):
+        return filename, raw_hash, entry, None
+
+    raw_text = raw.decode("utf-8")
+    processed = preprocess_transcript(raw_text)
+    rendered = render_outputs(processed, index_speaker_turns(raw_text, processed))
+    written = [os.path.basename(paths[kind]) for kind, data in rendered.items() if _write_if_changed(paths[kind], data)]
+    _remove_legacy_outputs(base_name)
+    entry = {"raw_sha256": raw_hash, "outputs": {kind: _sha256(data) for kind, data in rendered.items()}}
+    return filename, raw_hash, entry, written
+
+
+def _update_chunk(tasks):
+    return [_update_file(task) for task in tasks]
 
-        processed = preprocess_transcript(raw_text)
 
+def iter_updated(tasks, workers: int = WORKERS, chunk_size: int = CHUNK_SIZE):
+    """
+    Run _update_file over `tasks`, yielding its results in input order.
+
+    With `workers` > 1 the tasks are sent to a process pool `chunk_size` at a
+    time, so the hashing, preprocessing and writing all happen in the workers
+    and only the small results come back. At most two chunks per worker are in
+    flight, and results are consumed in submission order, so memory is bounded
+    by the pool size rather than the corpus and the order never depends on
+    which worker finishes first.
+    """
+    if workers <= 1 or len(tasks) <= chunk_size:
+        for task in tasks:
+            yield _update_file(task)
+        return
+
+    chunks = iter([tasks[i:i + chunk_size] for i in range(0, len(tasks), chunk_size)])
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        in_flight = deque(pool.submit(_update_chunk, chunk) for _, chunk in zip(range(2 * workers), chunks))
+        while in_flight:
+            results = in_flight.popleft().result()
+            chunk = next(chunks, None)
+            if chunk is not None:
+                in_flight.append(pool.submit(_update_chunk, chunk))
+            yield from results
+
+
+# Process All Files
+class PreprocessRun:
+    """
+    One incremental preprocessing run, fed a raw transcript at a time.
+
+    process_all_transcripts drives it over RAW_DIR through a process pool; the API's
+    streaming pipeline hands it each transcript as soon as it is fetched.
+    finish() removes the outputs of raw files it never saw and saves the
+    manifest; a run abandoned before that leaves the manifest as it was.
+    """
+
+    def __init__(self, force: bool = False):
+        manifest = load_manifest()
+        self.force = force
+        self.same_cleaner = manifest.get("cleaner_version") == CLEANER_VERSION
+        self.previous = manifest["files"]
+        self.files = {}
+        self.changes = {key: [] for key in ("added", "modified", "reprocessed", "unchanged", "removed",
+                                            "outputs_written")}
+
+    def task(self, filename: str) -> tuple:
+        """The _update_file task for one raw transcript."""
+        return filename, self.previous.get(filename), not self.force and self.same_cleaner
+
+    def record(self, result: tuple) -> bool:
+        """Add one _update_file result to the run; True when the transcript was rerun."""
+        filename, raw_hash, entry, written = result
         base_name = os.path.splitext(filename)[0]
-        out_full = os.path.join(PROCESSED_DIR, f"{base_name}_cleaned.txt")
-        out_prepared = os.path.join(PROCESSED_DIR, f"{base_name}_prepared.txt")
-        out_qa = os.path.join(PROCESSED_DIR, f"{base_name}_qa.txt")
+        self.files[filename] = entry
+        if written is None:
+            self.changes["unchanged"].append(base_name)
+            return False
+        self.changes["outputs_written"].extend(written)
+        previous = self.previous.get(filename)
+        if previous is None:
+            self.changes["added"].append(base_name)
+        elif previous.get("raw_sha256") != raw_hash:
+            self.changes["modified"].append(base_name)
+        else:
+            self.changes["reprocessed"].append(base_name)
+        return True
 
-        with open(out_full, "w", encoding="utf-8") as f:
-            f.write(processed["prepared"] + "\n\n" + processed["qa"])
+    def update(self, filename: str) -> bool:
+        """Preprocess one raw transcript unless it is current; True when it was rerun."""
+        return self.record(_update_file(self.task(filename)))
 
-        with open(out_prepared, "w", encoding="utf-8") as f:
-            f.write(processed["prepared"])
+    def finish(self) -> dict:
+        files, changes = self.files, self.changes
+        for filename in sorted(set(self.previous) - set(files)):
+            base_name = os.path.splitext(filename)[0]
+            for path in output_paths(base_name).values():
+                if os.path.exists(path):
+                    os.remove(path)
+            _remove_legacy_outputs(base_name)
+            changes["removed"].append(base_name)
 
-        with open(out_qa, "w", encoding="utf-8") as f:
-            f.write(processed["qa"])
+        changes["changed"] = changes["added"] + changes["modified"] + changes["reprocessed"]
+        _save_manifest({"cleaner_version": CLEANER_VERSION, "files": files, "last_run": changes})
 
-    print(f"\nCleaned transcripts saved to: {PROCESSED_DIR}")
+        print(f"\n{len(changes['changed'])} transcript(s) processed, {len(changes['unchanged'])} unchanged, "
+              f"{len(changes['removed'])} removed; {len(changes['outputs_written'])} file(s) written to: "
+              f"{PROCESSED_DIR}")
+        return changes
+
+
+def raw_transcripts(raw_dir: str = RAW_DIR) -> list:
+    """File names of the raw transcripts, sorted."""
+    return sorted(f for f in os.listdir(raw_dir) if f.lower().endswith(".txt"))
+
+
+def process_all_transcripts(force: bool = False, workers: int = WORKERS, chunk_size: int = CHUNK_SIZE,
+                            checkpoint=None) -> dict:
+    """
+    Preprocess new or modified raw transcripts and skip the rest.
+
+    A transcript is skipped when its raw hash, the cleaner version and the
+    hash of every output on disk all match the manifest. Outputs whose bytes
+    did not change are not rewritten, so their timestamps stay put. Outputs
+    of raw files that disappeared are removed.
+
+    Every raw file goes through iter_updated, so with `workers` > 1 the
+    staleness check, the preprocessing and the writes all run in the pool.
+
+    Returns the change report (also saved as the manifest's "last_run"), with
+    base names under added / modified / reprocessed (cleaner version bump or
+    damaged outputs) / unchanged / removed, `changed` for everything that was
+    rerun, and the output files actually written.
+
+    `checkpoint`, when given, is called as each transcript's result comes back and
+    may raise to abandon the run. The manifest is then left as it was, so the
+    next run redoes (without rewriting identical outputs) whatever was done.
+    Workers already busy finish their current chunk before the pool shuts down.
+    """
+    print("Preprocessing transcripts (split → clean → normalize)...")
+    run = PreprocessRun(force=force)
+    filenames = raw_transcripts()
+    results = iter_updated([run.task(f) for f in filenames], workers=workers, chunk_size=chunk_size)
+    for result in tqdm(results, total=len(filenames), desc="Processing transcripts"):
+        if checkpoint is not None:
+            checkpoint()
+        run.record(result)
+
+    return run.finish()
 
 
 if __name__ == "__main__":
-    process_all_transcripts()
\ No newline at end of file
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Clean raw transcripts into management / Q&A sections.")
+    parser.add_argument("--force", action="store_true", help="reprocess every transcript, ignoring the manifest")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="processes to clean transcripts in parallel")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="transcripts per pool task")
+    args = parser.parse_args()
+    process_all_transcripts(force=args.force, workers=args.workers, chunk_size=args.chunk_size)
\ No newline at end of file
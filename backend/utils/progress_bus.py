@@ -0,0 +1,68 @@
+import asyncio
+import threading
+
+# In-memory fan-out of pipeline progress events.
+# The pipeline publishes from its worker thread; each subscriber is an async
+# consumer (e.g. an SSE response) with its own bounded queue, fed through its
+# event loop. The bus also keeps the latest status so a client that connects
+# mid-run starts from the current state instead of an empty screen.
+QUEUE_SIZE = 256
+
+
+class ProgressBus:
+    def __init__(self, queue_size: int = QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._status = {}
+        self._subscribers = set()
+
+    def status(self) -> dict:
+        """Latest status published, or {} before the first one."""
+        with self._lock:
+            return dict(self._status)
+
+    def publish(self, event: str, data: dict, status: dict = None):
+        """
+        Send `event` to every subscriber. When `status` is given it also
+        becomes the snapshot handed to late subscribers.
+        """
+        with self._lock:
+            if status is not None:
+                self._status = dict(status)
+            subscribers = list(self._subscribers)
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(_offer, queue, (event, data))
+            except RuntimeError:
+                # The subscriber's loop has closed; its generator cleans up
+                pass
+
+    async def subscribe(self, heartbeat: float = None):
+        """
+        Yield (event, data) pairs, starting with ("status", latest status).
+        With `heartbeat`, yields None after that many idle seconds so the
+        caller can keep its connection alive.
+        """
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue(self.queue_size))
+        with self._lock:
+            self._subscribers.add(subscriber)
+            initial = dict(self._status)
+        try:
+            yield "status", initial
+            queue = subscriber[1]
+            while True:
+                try:
+                    yield await asyncio.wait_for(queue.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            with self._lock:
+                self._subscribers.discard(subscriber)
+
+
+def _offer(queue: asyncio.Queue, item):
+    # A slow subscriber loses its oldest events, never the newest; the status
+    # events it still receives carry the full current state.
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(item)
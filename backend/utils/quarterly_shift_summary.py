@@ -3,6 +3,8 @@ import json
 from typing import Dict, Any
 from ollama import chat
 
+from . import instrumentation
+
 
 MODEL = "llama3"
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))          # .../backend/utils
@@ -97,6 +99,7 @@ def summarize_quarterly_shift(shift_data: Dict[str, Any]) -> str:
         model=MODEL,
         messages=messages,
     )
+    instrumentation.record_llm_response(response)
     
     summary = response["message"]["content"].strip()
     return summary
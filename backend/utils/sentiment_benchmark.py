@@ -0,0 +1,192 @@
+import os
+import json
+import time
+import random
+import platform
+from datetime import datetime, timezone
+
+# Benchmarks must not depend on the network: use the locally cached FinBERT
+# weights (set these to "0" to allow a first download).
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
+os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+
+from . import instrumentation
+from . import model_registry
+from . import sentiment
+
+# Sentiment throughput benchmark.
+# Runs analyze_sentiment (uncached) over the bundled processed transcripts and
+# over synthetic corpora built by reshuffling their sentences, so larger scales
+# keep the real length distribution without repeating identical sections.
+# Results are written as JSON; pass --compare to diff against an earlier run.
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))          # .../backend/utils
+DATA_DIR = os.path.abspath(os.path.join(BASE_DIR, "..", "data"))  # .../backend/data
+BENCHMARK_DIR = os.path.join(DATA_DIR, "benchmarks")
+
+SCALES = (1, 10, 100)
+SEED = 13
+
+
+def _percentile(values, q):
+    """Nearest-rank percentile of a list of numbers (None when empty)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100))  # ceil(n * q / 100)
+    return ordered[int(rank) - 1]
+
+
+def load_corpus(processed_dir=sentiment.PROCESSED_DIR):
+    """Return [(label, text)] for every non-empty management / Q&A section."""
+    sections = []
+    for base in sentiment.transcript_store.list_transcripts(processed_dir):
+        for section, text in zip(("management", "qa"), sentiment._load_sections(processed_dir, base)):
+            if text.strip():
+                sections.append((f"{base}:{section}", text))
+    return sections
+
+
+def scale_corpus(sections, scale, seed=SEED):
+    """
+    Build `scale` copies of the corpus. Copy 0 is the original text; later
+    copies shuffle each section's sentences so chunks (and cache keys) differ
+    while the section and sentence lengths stay realistic.
+    """
+    rng = random.Random(seed)
+    scaled = []
+    for copy in range(scale):
+        for label, text in sections:
+            if copy == 0:
+                scaled.append((label, text))
+                continue
+            sentences = sentiment.SENTENCE_BREAK.split(text)
+            rng.shuffle(sentences)
+            scaled.append((f"{label}#{copy}", " ".join(sentences)))
+    return scaled
+
+
+def run_scale(sections, batch_size=sentiment.BATCH_SIZE, chunking=sentiment.CHUNKING,
+              backend=sentiment.BACKEND, token_budget=sentiment.TOKEN_BUDGET):
+    """
+    Score every section once and time it.
+
+    Per-chunk latency is each forward pass's wall time divided over the chunks
+    it carried, so p50/p95 reflect both batch shape and model speed (a
+    section's first pass also carries its tokenization).
+    """
+    chunks = 0
+    tokens = 0
+    chunk_latencies = []
+    start = time.perf_counter()
+    for _, text in sections:
+        done = 0
+        tick = time.perf_counter()
+        for event in sentiment.iter_analyze_sentiment(text, batch_size=batch_size, chunking=chunking,
+                                                      backend=backend, token_budget=token_budget):
+            now = time.perf_counter()
+            if event["type"] == "progress":
+                in_batch = event["chunks_done"] - done
+                done = event["chunks_done"]
+                chunk_latencies.extend([(now - tick) / in_batch] * in_batch)
+            else:
+                tokens += event["result"]["tokens"]
+            tick = now
+        chunks += done
+    seconds = time.perf_counter() - start
+
+    return {
+        "sections": len(sections),
+        "chunks": chunks,
+        "tokens": tokens,
+        "seconds": seconds,
+        "chunks_per_sec": chunks / seconds if seconds else None,
+        "tokens_per_sec": tokens / seconds if seconds else None,
+        "chunk_latency_p50_ms": (_percentile(chunk_latencies, 50) or 0) * 1000,
+        "chunk_latency_p95_ms": (_percentile(chunk_latencies, 95) or 0) * 1000,
+        "peak_rss_bytes": instrumentation.peak_rss_bytes(),
+    }
+
+
+def run_benchmark(scales=SCALES, batch_size=sentiment.BATCH_SIZE, chunking=sentiment.CHUNKING,
+                  backend=sentiment.BACKEND, token_budget=sentiment.TOKEN_BUDGET):
+    """Load the model, then benchmark each corpus scale. Returns the report dict."""
+    corpus = load_corpus()
+
+    load_start = time.perf_counter()
+    model_registry.load(sentiment.MODEL_NAME, backend)
+    model_load_seconds = time.perf_counter() - load_start
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "host": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "config": {
+            "model": sentiment.MODEL_NAME,
+            "backend": backend,
+            "chunking": chunking,
+            "batch_size": batch_size,
+            "token_budget": token_budget,
+        },
+        "model_load_seconds": model_load_seconds,
+        "peak_rss_after_load_bytes": instrumentation.peak_rss_bytes(),
+        "scales": {},
+    }
+    for scale in scales:
+        print(f"Benchmarking {scale}x corpus...")
+        result = run_scale(scale_corpus(corpus, scale), batch_size=batch_size, chunking=chunking,
+                           backend=backend, token_budget=token_budget)
+        report["scales"][f"{scale}x"] = result
+        print(f"  {result['chunks']} chunks, {result['chunks_per_sec']:.2f} chunks/s, "
+              f"{result['tokens_per_sec']:.0f} tokens/s, p95 {result['chunk_latency_p95_ms']:.1f} ms/chunk")
+    return report
+
+
+def compare_reports(baseline, current):
+    """Per-scale ratios of current vs baseline (>1 means faster / higher)."""
+    comparison = {}
+    for scale, now in current["scales"].items():
+        before = baseline.get("scales", {}).get(scale)
+        if not before:
+            continue
+        comparison[scale] = {
+            key: (now[key] / before[key]) if before.get(key) and now.get(key) is not None else None
+            for key in ("chunks_per_sec", "tokens_per_sec", "chunk_latency_p50_ms", "chunk_latency_p95_ms",
+                        "peak_rss_bytes")
+        }
+    return comparison
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark FinBERT sentiment throughput offline.")
+    parser.add_argument("--scales", type=int, nargs="+", default=list(SCALES),
+                        help="corpus multiples to run (1 = the bundled transcripts)")
+    parser.add_argument("--batch-size", type=int, default=sentiment.BATCH_SIZE)
+    parser.add_argument("--chunking", choices=["tokens", "sentences"], default=sentiment.CHUNKING)
+    parser.add_argument("--backend", choices=model_registry.BACKENDS, default=sentiment.BACKEND)
+    parser.add_argument("--token-budget", type=int, default=sentiment.TOKEN_BUDGET,
+                        help="padded tokens per forward pass (0 = fixed --batch-size batches)")
+    parser.add_argument("--output", help="where to write the JSON report (default: data/benchmarks/)")
+    parser.add_argument("--compare", help="earlier report to compare against")
+    args = parser.parse_args()
+
+    report = run_benchmark(scales=args.scales, batch_size=args.batch_size, chunking=args.chunking,
+                           backend=args.backend, token_budget=args.token_budget or None)
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            report["compared_to"] = {"file": args.compare, "ratios": compare_reports(json.load(f), report)}
+
+    output = args.output
+    if not output:
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = os.path.join(BENCHMARK_DIR, f"sentiment_{args.backend}_{stamp}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n Benchmark report saved to {output}")
+    if args.compare:
+        print(json.dumps(report["compared_to"]["ratios"], indent=2))
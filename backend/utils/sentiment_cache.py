@@ -0,0 +1,155 @@
+import os
+import time
+import sqlite3
+import hashlib
+from array import array
+
+# Persistent store of FinBERT probability vectors, keyed by content.
+# A chunk key covers the model name, the chunking parameters and a hash of the
+# exact token ids fed to the model, so unchanged transcripts never hit FinBERT
+# again. Section entries map the hash of a whole section's text to its chunk
+# keys, which lets an unchanged section skip tokenization as well.
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))          # .../backend/utils
+DATA_DIR = os.path.abspath(os.path.join(BASE_DIR, "..", "data"))  # .../backend/data
+CACHE_FILE = os.path.join(DATA_DIR, "cache", "sentiment_cache.sqlite")
+MAX_ENTRIES = 200_000  # chunk vectors kept before least-recently-used eviction
+MAX_SECTIONS = 20_000  # section entries kept, evicted the same way
+
+
+def chunk_key(model_name: str, params: str, input_ids) -> str:
+    digest = hashlib.sha256(array("q", input_ids).tobytes()).hexdigest()
+    return f"{model_name}|{params}|{digest}"
+
+
+def section_key(model_name: str, params: str, text: str) -> str:
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return f"{model_name}|{params}|{digest}"
+
+
+class SentimentCache:
+    """
+    SQLite-backed chunk cache with LRU eviction and hit/miss counters.
+    Chunk vectors and section entries are each capped and evicted
+    least-recently-used first.
+    """
+
+    def __init__(self, path: str = CACHE_FILE, max_entries: int = MAX_ENTRIES, max_sections: int = MAX_SECTIONS):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_sections = max_sections
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30)
+        self._conn.executescript(
+            """
+            PRAGMA journal_mode=WAL;
+            CREATE TABLE IF NOT EXISTS chunks (
+                key TEXT PRIMARY KEY,
+                probs BLOB NOT NULL,
+                last_used REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS chunks_last_used ON chunks(last_used);
+            CREATE TABLE IF NOT EXISTS sections (
+                key TEXT PRIMARY KEY,
+                chunk_keys TEXT NOT NULL,
+                tokens INTEGER NOT NULL
+            );
+            """
+        )
+        # Caches written before sections were evicted lack their last_used column
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(sections)")}
+        if "last_used" not in columns:
+            self._conn.execute("ALTER TABLE sections ADD COLUMN last_used REAL NOT NULL DEFAULT 0")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS sections_last_used ON sections(last_used)")
+        self._conn.commit()
+
+    def get_many(self, keys):
+        """Return {key: [p_negative, p_neutral, p_positive]} for the keys present."""
+        found = {}
+        unique = list(dict.fromkeys(keys))
+        for i in range(0, len(unique), 500):
+            batch = unique[i:i + 500]
+            placeholders = ",".join("?" * len(batch))
+            rows = self._conn.execute(
+                f"SELECT key, probs FROM chunks WHERE key IN ({placeholders})", batch
+            ).fetchall()
+            for key, blob in rows:
+                found[key] = array("f", blob).tolist()
+
+        if found:
+            now = time.time()
+            self._conn.executemany(
+                "UPDATE chunks SET last_used = ? WHERE key = ?", [(now, k) for k in found]
+            )
+            self._conn.commit()
+
+        for key in keys:
+            if key in found:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return found
+
+    def put_many(self, items):
+        """Store (key, probs) pairs, then evict down to `max_entries`."""
+        now = time.time()
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO chunks (key, probs, last_used) VALUES (?, ?, ?)",
+            [(key, array("f", probs).tobytes(), now) for key, probs in items],
+        )
+        self._conn.commit()
+        self._evict()
+
+    def get_section(self, key):
+        """Return (chunk_keys, tokens) for a previously seen section, or None."""
+        row = self._conn.execute(
+            "SELECT chunk_keys, tokens FROM sections WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        self._conn.execute("UPDATE sections SET last_used = ? WHERE key = ?", (time.time(), key))
+        self._conn.commit()
+        return (row[0].split("\n") if row[0] else []), row[1]
+
+    def put_section(self, key, chunk_keys, tokens):
+        """Store a section's chunk keys, then evict down to `max_sections`."""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO sections (key, chunk_keys, tokens, last_used) VALUES (?, ?, ?, ?)",
+            (key, "\n".join(chunk_keys), tokens, time.time()),
+        )
+        self._conn.commit()
+        self._evict("sections", self.max_sections)
+
+    def _evict(self, table: str = "chunks", limit: int = None):
+        limit = self.max_entries if limit is None else limit
+        (count,) = self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()
+        excess = count - limit
+        if excess <= 0:
+            return
+        self._conn.execute(
+            f"DELETE FROM {table} WHERE key IN "
+            f"(SELECT key FROM {table} ORDER BY last_used LIMIT ?)",
+            (excess,),
+        )
+        self._conn.commit()
+        self.evictions += excess
+
+    def stats(self) -> dict:
+        (entries,) = self._conn.execute("SELECT COUNT(*) FROM chunks").fetchone()
+        (sections,) = self._conn.execute("SELECT COUNT(*) FROM sections").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / lookups) if lookups else None,
+            "evictions": self.evictions,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "sections": sections,
+            "max_sections": self.max_sections,
+        }
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,127 @@
+import os
+import sys
+import mmap
+import struct
+import hashlib
+from array import array
+
+# Compact per-passage sentiment scores.
+# One file per (transcript, section, level), where level is "chunk" or
+# "sentence". Layout, little-endian:
+#   header  : b"SNT1", uint32 count, 32-byte sha256 of the section text
+#   columns : start[count] uint32, end[count] uint32,
+#             negative[count] float32, neutral[count] float32, positive[count] float32
+# start / end are character offsets into the processed section text. Readers
+# memory-map the file and touch only the columns they need.
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))          # .../backend/utils
+DATA_DIR = os.path.abspath(os.path.join(BASE_DIR, "..", "data"))  # .../backend/data
+SCORES_DIR = os.path.join(DATA_DIR, "sentiment_scores")
+
+MAGIC = b"SNT1"
+HEADER = struct.Struct("<4sI32s")
+LEVELS = ("chunk", "sentence")
+SECTIONS = ("management", "qa")
+COLUMNS = (("start", "I"), ("end", "I"), ("negative", "f"), ("neutral", "f"), ("positive", "f"))
+LABELS = ("negative", "neutral", "positive")
+
+
+def score_path(base: str, section: str, level: str, scores_dir: str = SCORES_DIR) -> str:
+    return os.path.join(scores_dir, f"{base}.{section}.{level}.bin")
+
+
+def _text_digest(text: str) -> bytes:
+    return hashlib.sha256(text.encode("utf-8")).digest()
+
+
+def _le(values: array) -> array:
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values
+
+
+def write_scores(base, section, level, text, spans, rows, scores_dir=SCORES_DIR):
+    """
+    Persist one section's passage scores.
+
+    `spans` are (start, end) character offsets and `rows` the matching
+    [negative, neutral, positive] probabilities.
+    """
+    columns = [
+        array("I", [s for s, _ in spans]),
+        array("I", [e for _, e in spans]),
+    ] + [array("f", [r[i] for r in rows]) for i in range(len(LABELS))]
+
+    path = score_path(base, section, level, scores_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(spans), _text_digest(text)))
+        for column in columns:
+            f.write(_le(column).tobytes())
+    os.replace(tmp_path, path)
+    return path
+
+
+def is_current(base, section, level, text, scores_dir=SCORES_DIR) -> bool:
+    """True when a score file exists and was built from exactly this section text."""
+    path = score_path(base, section, level, scores_dir)
+    try:
+        with open(path, "rb") as f:
+            magic, _, digest = HEADER.unpack(f.read(HEADER.size))
+    except (OSError, struct.error):
+        return False
+    return magic == MAGIC and digest == _text_digest(text)
+
+
+def query_scores(path, label=None, min_score=0.0, offset=0, limit=50):
+    """
+    Page through a score file without reading it into memory.
+
+    Passages are kept when the `label` probability is at least `min_score`
+    (no filter when `label` is None). Returns the total match count and the
+    requested page as dicts with offsets and scores, in text order.
+    """
+    if label is not None and label not in LABELS:
+        raise ValueError(f"label must be one of {LABELS}")
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        magic, count, _ = HEADER.unpack_from(mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not a sentiment score file: {path}")
+
+        view = memoryview(mm)
+        raw = {}
+        pos = HEADER.size
+        for name, typecode in COLUMNS:
+            raw[name] = view[pos:pos + 4 * count].cast(typecode)
+            pos += 4 * count
+
+        try:
+            columns = raw
+            if sys.byteorder != "little":
+                # Rare on our hosts; fall back to byte-swapped copies
+                columns = {name: _le(array(tc, raw[name].tobytes())) for name, tc in COLUMNS}
+
+            if label is None:
+                matches = range(count)
+                total = count
+            else:
+                key = columns[label]
+                matches = [i for i in range(count) if key[i] >= min_score]
+                total = len(matches)
+
+            items = [
+                {
+                    "start": columns["start"][i],
+                    "end": columns["end"][i],
+                    "scores": {name: columns[name][i] for name in ("positive", "neutral", "negative")},
+                }
+                for i in matches[offset:offset + limit]
+            ]
+        finally:
+            # Views must be released before the mmap can close
+            for column in raw.values():
+                column.release()
+            view.release()
+
+    return {"total": total, "offset": offset, "limit": limit, "items": items}
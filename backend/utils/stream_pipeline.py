@@ -0,0 +1,148 @@
+import queue
+import threading
+from collections import namedtuple
+
+# Item-at-a-time streaming between pipeline steps.
+# A chain is a source followed by steps, each on its own thread and joined
+# by bounded queues: a step starts on an item as soon as the step before it
+# hands one over, and a step that falls behind blocks the ones feeding it
+# (backpressure) instead of letting work pile up in memory. Only once every
+# item has passed through every step do the steps run finish(), in chain
+# order, so combined artifacts are written once, from every item, and never
+# by a chain that failed part way. The first failure anywhere stops the
+# whole chain and is re-raised; finish() is skipped from then on.
+QUEUE_SIZE = 2        # items waiting between two steps
+POLL_SECONDS = 0.1    # how often blocked steps check whether the chain was stopped
+
+# process(item) returns what to hand to the next step (None drops the item).
+# For the source, process(emit) calls emit(item) for every item it produces.
+# start() runs on the step's thread before its first item (e.g. to open
+# thread-bound resources), finish() once the whole chain has drained without
+# error, and close() always, last.
+Step = namedtuple("Step", "name process start finish close", defaults=(None, None, None))
+
+_END = object()
+
+
+class ChainAborted(Exception):
+    """Raised inside steps that were stopped because another step failed."""
+
+
+def run_chain(source: Step, steps, queue_size: int = QUEUE_SIZE, checkpoint=None, on_start=None, on_end=None):
+    """
+    Run `source` and `steps` concurrently until every item has passed through.
+
+    `checkpoint()` is called before each item in every step and may raise to
+    stop the chain. `on_start(step)` and `on_end(step, error)` run on each
+    step's thread around its work; `error` is None when the step completed,
+    the exception it raised, or a ChainAborted when another step failed.
+    """
+    steps = list(steps)
+    queues = [queue.Queue(queue_size) for _ in steps]
+    stopped = threading.Event()
+    errors = []
+    errors_lock = threading.Lock()
+
+    def put(q, item):
+        while not stopped.is_set():
+            try:
+                q.put(item, timeout=POLL_SECONDS)
+                return
+            except queue.Full:
+                pass
+        raise ChainAborted("Stopped after a failure in another step")
+
+    def get(q):
+        while not stopped.is_set():
+            try:
+                return q.get(timeout=POLL_SECONDS)
+            except queue.Empty:
+                pass
+        raise ChainAborted("Stopped after a failure in another step")
+
+    # Set when the last step has seen every item, then per step once its finish() ran
+    drained = threading.Event()
+    finished = [threading.Event() for _ in range(len(steps) + 1)]
+
+    def wait_for(event):
+        while not stopped.is_set():
+            if event.wait(POLL_SECONDS):
+                return
+        raise ChainAborted("Stopped after a failure in another step")
+
+    def finish(position, step):
+        wait_for(drained)
+        if position:
+            wait_for(finished[position - 1])
+        if step.finish is not None:
+            step.finish()
+        finished[position].set()
+
+    def emit(item):
+        if checkpoint is not None:
+            checkpoint()
+        if queues:
+            put(queues[0], item)
+
+    def run_source():
+        source.process(emit)
+        if queues:
+            put(queues[0], _END)
+        else:
+            drained.set()
+        finish(0, source)
+
+    def run_step(i):
+        step = steps[i]
+        inbox = queues[i]
+        outbox = queues[i + 1] if i + 1 < len(queues) else None
+        while True:
+            item = get(inbox)
+            if item is _END:
+                break
+            if checkpoint is not None:
+                checkpoint()
+            result = step.process(item)
+            if result is not None and outbox is not None:
+                put(outbox, result)
+        if outbox is not None:
+            put(outbox, _END)
+        else:
+            drained.set()
+        finish(i + 1, step)
+
+    def guarded(step, body):
+        error = None
+        try:
+            if on_start is not None:
+                on_start(step)
+            if step.start is not None:
+                step.start()
+            body()
+        except ChainAborted as e:
+            error = e
+        except BaseException as e:
+            error = e
+            with errors_lock:
+                errors.append(e)
+            stopped.set()
+        finally:
+            try:
+                if step.close is not None:
+                    step.close()
+            finally:
+                if on_end is not None:
+                    on_end(step, error)
+
+    threads = [threading.Thread(target=guarded, args=(source, run_source), name=f"stream-{source.name}", daemon=True)]
+    threads += [
+        threading.Thread(target=guarded, args=(step, lambda i=i: run_step(i)), name=f"stream-{step.name}",
+                         daemon=True)
+        for i, step in enumerate(steps)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
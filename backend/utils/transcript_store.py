@@ -0,0 +1,93 @@
+import os
+import mmap
+import struct
+
+# Processed transcripts, one file per transcript.
+# Layout, little-endian:
+#   header : b"PTX1", uint32 prepared_start, prepared_end, qa_start, qa_end
+#   body   : prepared remarks + "\n\n" + Q&A, UTF-8
+# Offsets are absolute byte positions. "cleaned" (the whole call) is the span
+# from prepared_start to qa_end, so it is never stored twice. Readers
+# memory-map the file and decode only the section they ask for.
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))          # .../backend/utils
+DATA_DIR = os.path.abspath(os.path.join(BASE_DIR, "..", "data"))  # .../backend/data
+PROCESSED_DIR = os.path.join(DATA_DIR, "processed_transcripts")
+
+MAGIC = b"PTX1"
+HEADER = struct.Struct("<4s4I")
+SUFFIX = ".transcript.bin"
+SECTIONS = ("cleaned", "prepared", "qa")
+SEPARATOR = b"\n\n"
+# Names the API and frontend use for each section of a transcript
+VIRTUAL_SUFFIXES = {"cleaned": "_cleaned.txt", "prepared": "_prepared.txt", "qa": "_qa.txt"}
+
+
+def transcript_path(base: str, processed_dir: str = PROCESSED_DIR) -> str:
+    return os.path.join(processed_dir, f"{base}{SUFFIX}")
+
+
+def list_transcripts(processed_dir: str = PROCESSED_DIR) -> list:
+    """Base names of every processed transcript, sorted."""
+    if not os.path.isdir(processed_dir):
+        return []
+    return sorted(f[:-len(SUFFIX)] for f in os.listdir(processed_dir) if f.endswith(SUFFIX))
+
+
+def render(prepared: str, qa: str) -> bytes:
+    """File contents for one processed transcript."""
+    prepared_bytes = prepared.encode("utf-8")
+    qa_bytes = qa.encode("utf-8")
+    prepared_start = HEADER.size
+    prepared_end = prepared_start + len(prepared_bytes)
+    qa_start = prepared_end + len(SEPARATOR)
+    qa_end = qa_start + len(qa_bytes)
+    header = HEADER.pack(MAGIC, prepared_start, prepared_end, qa_start, qa_end)
+    return header + prepared_bytes + SEPARATOR + qa_bytes
+
+
+def _span(offsets, section):
+    prepared_start, prepared_end, qa_start, qa_end = offsets
+    if section == "prepared":
+        return prepared_start, prepared_end
+    if section == "qa":
+        return qa_start, qa_end
+    if section == "cleaned":
+        return prepared_start, qa_end
+    raise ValueError(f"section must be one of {SECTIONS}")
+
+
+def read_sections(path: str, sections=("prepared", "qa")) -> tuple:
+    """
+    Text of the requested sections of one processed transcript, in the order
+    asked. Only the bytes of those sections are decoded.
+    """
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        magic, *offsets = HEADER.unpack_from(mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not a processed transcript: {path}")
+        view = memoryview(mm)
+        try:
+            texts = []
+            for section in sections:
+                start, end = _span(offsets, section)
+                with view[start:end] as part:
+                    texts.append(str(part, "utf-8"))
+        finally:
+            # Views must be released before the mmap can close
+            view.release()
+    return tuple(texts)
+
+
+def read_section(path: str, section: str) -> str:
+    return read_sections(path, (section,))[0]
+
+
+def resolve_virtual_name(filename: str):
+    """
+    Map a virtual section file name ("<base>_qa.txt", ...) to (base, section),
+    or None when it does not name a section.
+    """
+    for section, suffix in VIRTUAL_SUFFIXES.items():
+        if filename.endswith(suffix):
+            return filename[:-len(suffix)], section
+    return None
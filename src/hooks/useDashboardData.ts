@@ -61,12 +61,25 @@ interface QuarterlyShiftSummary {
   content: string;
 }
 
+interface DashboardSnapshot {
+  version: string;
+  missing: string[];
+  sentiment: SentimentEntry[] | null;
+  strategic_focuses: Record<string, StrategicFocus[]> | null;
+  quarterly_shift: QuarterlyShiftData | null;
+  quarterly_shift_summary: QuarterlyShiftSummary | null;
+  quarterly_prices: QuarterlyPriceData | null;
+  transcripts: Transcript[] | null;
+}
+
 export function useDashboardData() {
   const [isRefreshing, setIsRefreshing] = useState(false);
   const [isLoadingData, setIsLoadingData] = useState(false);
   const [error, setError] = useState<string | null>(null);
   const [pipelineStatus, setPipelineStatus] = useState<string | null>(null);
-  const [isPollingStatus, setIsPollingStatus] = useState(false);
+  const [isWatchingStatus, setIsWatchingStatus] = useState(false);
+  // Progress is pushed over Server-Sent Events; polling is the fallback when the stream is unavailable
+  const [statusTransport, setStatusTransport] = useState<"events" | "poll">("events");
 
   const [sentiment, setSentiment] = useState<SentimentEntry[] | null>(null);
   const [strategicFocuses, setStrategicFocuses] = useState<Record<string, StrategicFocus[]> | null>(null);
@@ -84,63 +97,25 @@ export function useDashboardData() {
     setIsRefreshing(true);
     setError(null);
     setPipelineStatus("Starting pipeline...");
-    setIsPollingStatus(false);
+    setIsWatchingStatus(false);
 
     try {
       const res = await fetch(`${API_BASE}/pipeline/refresh`, { method: "POST" });
       if (!res.ok) {
         throw new Error(`Pipeline error: ${res.status}`);
       }
-      setIsPollingStatus(true);
+      setIsWatchingStatus(true);
     } catch (e: any) {
       const message = e.message || "Failed to start pipeline";
       setError(message);
       setPipelineStatus(`Pipeline failed: ${message}`);
-      setIsPollingStatus(false);
+      setIsWatchingStatus(false);
     } finally {
       setIsRefreshing(false);
     }
   };
 
-  const loadSentiment = async () => {
-    const res = await fetch(`${API_BASE}/sentiment`);
-    if (!res.ok) throw new Error("Failed to load sentiment");
-    const data = await res.json();
-    setSentiment(data);
-  };
-
-  const loadStrategicFocuses = async () => {
-    const res = await fetch(`${API_BASE}/strategic_focuses`);
-    if (!res.ok) throw new Error("Failed to load strategic focuses");
-    const data = await res.json();
-    setStrategicFocuses(data);
-  };
-
-  const loadQuarterlyShift = async () => {
-    const res = await fetch(`${API_BASE}/quarterly_shift`);
-    if (!res.ok) throw new Error("Failed to load quarterly shift");
-    const data = await res.json();
-    setQuarterlyShift(data);
-  };
-
-  const loadQuarterlyShiftSummary = async () => {
-    const res = await fetch(`${API_BASE}/summaries/quarterly_shift`);
-    if (!res.ok) throw new Error("Failed to load quarterly shift summary");
-    const data = await res.json();
-    setQuarterlyShiftSummary(data);
-  };
-
-  const loadQuarterlyPrices = async () => {
-    const res = await fetch(`${API_BASE}/quarterly_prices`);
-    if (!res.ok) throw new Error("Failed to load quarterly prices");
-    const data = await res.json();
-    setQuarterlyPrices(data);
-  };
-
-  const loadTranscriptsList = async () => {
-    const res = await fetch(`${API_BASE}/transcripts`);
-    if (!res.ok) throw new Error("Failed to load transcripts list");
-    const data = await res.json();
+  const applyTranscriptsList = (data: Transcript[]) => {
     const cleaned = data.filter((t: Transcript) => t.name.endsWith("_cleaned.txt"));
     cleaned.sort((a: Transcript, b: Transcript) => a.name.localeCompare(b.name));
     setTranscripts(cleaned);
@@ -161,14 +136,21 @@ export function useDashboardData() {
     setIsLoadingData(true);
     setError(null);
     try {
-      await Promise.all([
-        loadSentiment().catch((e) => console.warn(e)),
-        loadStrategicFocuses().catch((e) => console.warn(e)),
-        loadQuarterlyShift().catch((e) => console.warn(e)),
-        loadQuarterlyShiftSummary().catch((e) => console.warn(e)),
-        loadQuarterlyPrices().catch((e) => console.warn(e)),
-        loadTranscriptsList().catch((e) => console.warn(e)),
-      ]);
+      // One round trip for every artifact; fields still being generated come back null
+      const res = await fetch(`${API_BASE}/dashboard`);
+      if (!res.ok) throw new Error(`Failed to load dashboard data: ${res.status}`);
+      const data: DashboardSnapshot = await res.json();
+      if (data.missing.length > 0) {
+        console.warn(`Dashboard artifacts not available yet: ${data.missing.join(", ")}`);
+      }
+      if (data.sentiment) setSentiment(data.sentiment);
+      if (data.strategic_focuses) setStrategicFocuses(data.strategic_focuses);
+      if (data.quarterly_shift) setQuarterlyShift(data.quarterly_shift);
+      if (data.quarterly_shift_summary) setQuarterlyShiftSummary(data.quarterly_shift_summary);
+      if (data.quarterly_prices) setQuarterlyPrices(data.quarterly_prices);
+      if (data.transcripts) applyTranscriptsList(data.transcripts);
+    } catch (e) {
+      console.warn(e);
     } finally {
       setIsLoadingData(false);
     }
@@ -178,9 +160,50 @@ export function useDashboardData() {
     loadAllData();
   }, []);
 
+  const applyPipelineStatus = (data: any) => {
+    if (data && typeof data.message === "string") {
+      setPipelineStatus(data.message);
+    } else {
+      setPipelineStatus("Pipeline status: " + JSON.stringify(data));
+    }
+  };
+
+  // Show a quarter as soon as it is scored, while later ones are still running
+  const mergeSentimentEntry = (entry: SentimentEntry) => {
+    setSentiment((prev) => [...(prev || []).filter((e) => e.file !== entry.file), entry]);
+  };
+
+  // Pipeline progress pushed by the server
+  useEffect(() => {
+    if (!isWatchingStatus || statusTransport !== "events") return;
+
+    const source = new EventSource(`${API_BASE}/pipeline/events`);
+    source.addEventListener("status", (e) => {
+      const data = JSON.parse((e as MessageEvent).data);
+      applyPipelineStatus(data);
+      if (data.state === "done" || data.state === "error" || data.state === "cancelled") {
+        source.close();
+        setIsWatchingStatus(false);
+      }
+    });
+    source.addEventListener("transcript", (e) => {
+      const data = JSON.parse((e as MessageEvent).data);
+      if (data.entry) mergeSentimentEntry(data.entry);
+    });
+    source.onerror = () => {
+      // EventSource reconnects on its own unless the endpoint itself failed
+      if (source.readyState === EventSource.CLOSED) {
+        console.warn("Pipeline event stream unavailable, falling back to polling");
+        setStatusTransport("poll");
+      }
+    };
+
+    return () => source.close();
+  }, [isWatchingStatus, statusTransport]);
+
   // Polling for pipeline status
   useEffect(() => {
-    if (!isPollingStatus) return;
+    if (!isWatchingStatus || statusTransport !== "poll") return;
 
     let cancelled = false;
     const intervalId = setInterval(async () => {
@@ -190,15 +213,22 @@ export function useDashboardData() {
         const data = await res.json();
         if (cancelled) return;
 
-        if (data && typeof data.message === "string") {
-          setPipelineStatus(data.message);
-        } else {
-          setPipelineStatus("Pipeline status: " + JSON.stringify(data));
+        applyPipelineStatus(data);
+
+        // Show quarters as soon as they are scored, while later ones are still running
+        if (typeof data.sentiment_progress === "number") {
+          const partialRes = await fetch(`${API_BASE}/sentiment/partial`);
+          if (partialRes.ok && !cancelled) {
+            const partial = await partialRes.json();
+            if (partial.results && partial.results.length > 0) {
+              setSentiment(partial.results);
+            }
+          }
         }
 
-        if (data.state === "done" || data.state === "error") {
+        if (data.state === "done" || data.state === "error" || data.state === "cancelled") {
           clearInterval(intervalId);
-          setIsPollingStatus(false);
+          setIsWatchingStatus(false);
         }
       } catch (err) {
         console.warn("Error polling pipeline status:", err);
@@ -209,7 +239,7 @@ export function useDashboardData() {
       cancelled = true;
       clearInterval(intervalId);
     };
-  }, [isPollingStatus]);
+  }, [isWatchingStatus, statusTransport]);
 
   // Load section transcripts
   useEffect(() => {